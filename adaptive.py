@@ -0,0 +1,170 @@
+"""Adaptive difficulty driven by per-category Elo ratings
+
+Every player has a rating per category; every difficulty level has a fixed
+rating on the same scale. The chance of a correct answer is the usual Elo
+expectation, so after each answer the player's rating moves by
+``k * (actual - expected)`` and the next question's difficulty is the level
+whose expected accuracy is closest to ``TARGET_ACCURACY``.
+
+Ratings persist in SQLite between sessions, and questions come from the
+bank's (category, difficulty) index with ``QuestionBank.pick``, so choosing
+the next question never scans the pool.
+"""
+from __future__ import annotations
+import random
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from engine import Outcome
+from models import Question
+from question_bank import CATEGORY_MAP
+
+DIFFICULTY_RATINGS = {"Easy": 1000.0, "Medium": 1200.0, "Hard": 1400.0}
+INITIAL_RATING = 1200.0
+TARGET_ACCURACY = 0.7
+K_FACTOR = 32.0
+# Ratings settle down once a category has this many answers behind it
+PROVISIONAL_ANSWERS = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ratings (
+    player TEXT NOT NULL,
+    category TEXT NOT NULL,
+    rating REAL NOT NULL,
+    answered INTEGER NOT NULL,
+    PRIMARY KEY (player, category)
+) WITHOUT ROWID;
+"""
+
+def expected(rating: float, difficulty: str) -> float:
+    """Elo chance that a player at ``rating`` answers a ``difficulty`` question"""
+    return 1.0 / (1.0 + 10 ** ((DIFFICULTY_RATINGS[difficulty] - rating) / 400.0))
+
+# ---------------- RATING STORE ----------------
+
+class RatingStore:
+    """Per-player, per-category ratings in SQLite"""
+
+    def __init__(self, path, busy_timeout=30.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def load(self, player) -> Dict[str, Tuple[float, int]]:
+        """category -> (rating, answered) for one player (primary-key range scan)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT category, rating, answered FROM ratings WHERE player = ?", (player,)
+            ).fetchall()
+        return {category: (rating, answered) for category, rating, answered in rows}
+
+    def save(self, player, ratings: Dict[str, Tuple[float, int]]):
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO ratings (player, category, rating, answered) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (player, category) DO UPDATE SET "
+                    "rating = excluded.rating, answered = excluded.answered",
+                    ((player, category, rating, answered) for category, (rating, answered) in ratings.items())
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+# ---------------- SELECTOR ----------------
+
+class AdaptiveSelector:
+    """Picks each next question from the player's live ratings
+
+    ``category`` is an OpenTDB category id (None for a mix). Hand
+    ``record`` to ``QuizGame`` as an answer listener and iterate
+    ``questions(amount)`` - the stream is lazy, so every question is chosen
+    after the previous answer has moved the rating.
+    """
+
+    def __init__(self, get_bank: Callable, player, category=None, store: Optional[RatingStore] = None,
+                 seen=None, target=TARGET_ACCURACY, rng=None):
+        self.get_bank = get_bank
+        self.player = player
+        self.category = CATEGORY_MAP.get(category) if category else None
+        self.store = store
+        self.seen = seen
+        self.target = target
+        self.rng = rng or random.Random()
+        self.ratings: Dict[str, Tuple[float, int]] = store.load(player) if store else {}
+
+    def rating(self, category) -> float:
+        if category in self.ratings:
+            return self.ratings[category][0]
+        if self.ratings:
+            # A new category starts from the player's average elsewhere
+            return sum(r for r, _ in self.ratings.values()) / len(self.ratings)
+        return INITIAL_RATING
+
+    def next_difficulty(self, category) -> str:
+        rating = self.rating(category)
+        return min(DIFFICULTY_RATINGS, key=lambda d: abs(expected(rating, d) - self.target))
+
+    def _levels(self, difficulty):
+        """The chosen level first, then the others nearest in rating"""
+        aim = DIFFICULTY_RATINGS[difficulty]
+        return sorted(DIFFICULTY_RATINGS, key=lambda d: abs(DIFFICULTY_RATINGS[d] - aim))
+
+    def next_question(self, attempts=8) -> Optional[Question]:
+        bank = self.get_bank()
+        category = self.category or self.rng.choice(list(CATEGORY_MAP.values()))
+        fallback = None
+        for difficulty in self._levels(self.next_difficulty(category)):
+            for _ in range(attempts):
+                q = bank.pick(category, difficulty, self.rng)
+                if q is None:
+                    break
+                # Skip anything already shown this session while fresh ones turn up
+                if self.seen is None or self.seen.add(q):
+                    return q
+                fallback = fallback or q
+        if fallback is None and not self.category:
+            # The random category was empty - any question will do
+            fallback = bank.pick(None, self.next_difficulty(None), self.rng) or bank.pick(rng=self.rng)
+        return fallback
+
+    def questions(self, amount) -> Iterator[Question]:
+        for _ in range(amount):
+            q = self.next_question()
+            if q is None:
+                return
+            yield q
+
+    def record(self, q: Question, choice: Optional[int], outcome: Outcome, response_time=None):
+        """Move the player's rating in ``q``'s category by the surprise of the outcome"""
+        if q.difficulty not in DIFFICULTY_RATINGS:
+            return
+        rating = self.rating(q.category)
+        answered = self.ratings.get(q.category, (rating, 0))[1]
+        k = K_FACTOR if answered < PROVISIONAL_ANSWERS else K_FACTOR / 2
+        rating += k * ((1.0 if outcome.correct else 0.0) - expected(rating, q.difficulty))
+        self.ratings[q.category] = (rating, answered + 1)
+
+    def save(self):
+        if self.store and self.ratings:
+            self.store.save(self.player, self.ratings)
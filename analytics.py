@@ -0,0 +1,207 @@
+"""Vectorised analytics over every stored game
+
+Results are loaded once into NumPy column arrays. Each statistic is then a
+handful of array operations (bincount, percentile, masked division), with
+no Python loop over games, so it stays fast over millions of results.
+
+    python analytics.py [--db high_scores.db]
+
+NumPy is an optional dependency: ``pip install numpy``.
+"""
+from __future__ import annotations
+import argparse
+import json
+import sys
+from typing import Dict, Iterable, List
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from models import Result
+
+# ---------------- COLUMNAR LOAD ----------------
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("analytics needs NumPy - install it with: pip install numpy")
+
+class ResultColumns:
+    """All results as parallel arrays
+
+    Per-game columns are indexed by result row. ``category_stats`` is
+    flattened into four parallel arrays (row, category code, correct, total)
+    with one entry per (game, category) pair.
+    """
+
+    def __init__(self, players, player_names, scores, max_scores, dates, total_times,
+                 cs_row, cs_category, cs_correct, cs_total, category_names):
+        self.players = players
+        self.player_names = player_names
+        self.scores = scores
+        self.max_scores = max_scores
+        self.dates = dates
+        self.total_times = total_times
+        self.cs_row = cs_row
+        self.cs_category = cs_category
+        self.cs_correct = cs_correct
+        self.cs_total = cs_total
+        self.category_names = category_names
+
+    def __len__(self):
+        return len(self.scores)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[tuple]):
+        """Build from (player_name, score, max_score, date, total_time, data) rows"""
+        _require_numpy()
+        player_codes: Dict[str, int] = {}
+        category_codes: Dict[str, int] = {}
+        players: List[int] = []
+        scores: List[float] = []
+        max_scores: List[int] = []
+        dates: List[str] = []
+        times: List[float] = []
+        cs_row: List[int] = []
+        cs_category: List[int] = []
+        cs_correct: List[int] = []
+        cs_total: List[int] = []
+
+        for row, (name, score, max_score, date, total_time, data) in enumerate(rows):
+            players.append(player_codes.setdefault(name, len(player_codes)))
+            scores.append(score)
+            max_scores.append(max_score)
+            dates.append(date)
+            times.append(float("nan") if total_time is None else total_time)
+
+            stats = data.get("category_stats") if isinstance(data, dict) else json.loads(data).get("category_stats")
+            for category, s in (stats or {}).items():
+                cs_row.append(row)
+                cs_category.append(category_codes.setdefault(category, len(category_codes)))
+                cs_correct.append(s["correct"])
+                cs_total.append(s["total"])
+
+        return cls(
+            players=np.array(players, dtype=np.int64),
+            player_names=list(player_codes),
+            scores=np.array(scores, dtype=np.float64),
+            max_scores=np.array(max_scores, dtype=np.int64),
+            dates=np.array(dates, dtype="datetime64[s]"),
+            total_times=np.array(times, dtype=np.float64),
+            cs_row=np.array(cs_row, dtype=np.int64),
+            cs_category=np.array(cs_category, dtype=np.int64),
+            cs_correct=np.array(cs_correct, dtype=np.int64),
+            cs_total=np.array(cs_total, dtype=np.int64),
+            category_names=list(category_codes)
+        )
+
+    @classmethod
+    def from_results(cls, results: Iterable[Result]):
+        return cls.from_rows(
+            (r.player_name, r.score, r.max_score, r.date, r.total_time, {"category_stats": r.category_stats})
+            for r in results
+        )
+
+    @classmethod
+    def from_store(cls, store):
+        """Load every result in a ScoreStore"""
+        return cls.from_rows(store.iter_rows())
+
+# ---------------- STATISTICS ----------------
+
+def category_accuracy(cols: ResultColumns):
+    """Per category: correct answers, questions seen and accuracy"""
+    n = len(cols.category_names)
+    correct = np.bincount(cols.cs_category, weights=cols.cs_correct, minlength=n)
+    total = np.bincount(cols.cs_category, weights=cols.cs_total, minlength=n)
+    accuracy = np.divide(correct, total, out=np.zeros(n), where=total > 0)
+    return {
+        name: {"correct": int(correct[i]), "total": int(total[i]), "accuracy": float(accuracy[i])}
+        for i, name in enumerate(cols.category_names)
+    }
+
+def score_percentiles(cols: ResultColumns, percentiles=(10, 25, 50, 75, 90, 99)):
+    """Percentiles of score as a fraction of the maximum, so game lengths compare"""
+    if not len(cols):
+        return {}
+    ratio = cols.scores / np.maximum(cols.max_scores, 1)
+    return dict(zip(percentiles, np.percentile(ratio, percentiles).tolist()))
+
+def time_per_question(cols: ResultColumns, percentiles=(10, 50, 90, 99), bins=20):
+    """Distribution of total_time / questions over games that recorded a time"""
+    valid = ~np.isnan(cols.total_times) & (cols.max_scores > 0)
+    per_question = cols.total_times[valid] / cols.max_scores[valid]
+    if not per_question.size:
+        return {"games": 0}
+    counts, edges = np.histogram(per_question, bins=bins)
+    return {
+        "games": int(per_question.size),
+        "mean": float(per_question.mean()),
+        "percentiles": dict(zip(percentiles, np.percentile(per_question, percentiles).tolist())),
+        "histogram": (counts.tolist(), edges.tolist()),
+    }
+
+def player_trends(cols: ResultColumns, min_games=3):
+    """Least-squares slope of each player's score ratio per day
+
+    All per-player sums are bincounts over the player code column, so the
+    fit for every player happens at once.
+    """
+    n_players = len(cols.player_names)
+    if not len(cols):
+        return {}
+    y = cols.scores / np.maximum(cols.max_scores, 1)
+    x = (cols.dates - cols.dates.min()).astype(np.float64) / 86400.0
+
+    games = np.bincount(cols.players, minlength=n_players).astype(np.float64)
+    sx = np.bincount(cols.players, weights=x, minlength=n_players)
+    sy = np.bincount(cols.players, weights=y, minlength=n_players)
+    sxx = np.bincount(cols.players, weights=x * x, minlength=n_players)
+    sxy = np.bincount(cols.players, weights=x * y, minlength=n_players)
+
+    denom = games * sxx - sx * sx
+    ok = (games >= min_games) & (denom > 1e-12)
+    slope = np.divide(games * sxy - sx * sy, denom, out=np.zeros(n_players), where=ok)
+    mean = np.divide(sy, games, out=np.zeros(n_players), where=games > 0)
+
+    return {
+        cols.player_names[i]: {"games": int(games[i]), "mean": float(mean[i]), "slope_per_day": float(slope[i])}
+        for i in np.flatnonzero(ok)
+    }
+
+# ---------------- CLI ----------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vectorised analytics over stored results")
+    parser.add_argument("--db", default="high_scores.db")
+    parser.add_argument("--min-games", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    from score_store import ScoreStore
+    cols = ResultColumns.from_store(ScoreStore(args.db))
+    print(f"{len(cols):,} results, {len(cols.player_names):,} players")
+
+    print("\nCategory accuracy:")
+    for name, s in sorted(category_accuracy(cols).items(), key=lambda kv: kv[1]["accuracy"]):
+        print(f"  {name:28} {s['accuracy']:6.1%}  ({s['correct']:,}/{s['total']:,})")
+
+    print("\nScore percentiles (fraction of max):")
+    for p, v in score_percentiles(cols).items():
+        print(f"  p{p:<3} {v:.2f}")
+
+    times = time_per_question(cols)
+    if times["games"]:
+        print(f"\nTime per question: mean {times['mean']:.1f} s, "
+              + ", ".join(f"p{p} {v:.1f} s" for p, v in times["percentiles"].items()))
+
+    trends = player_trends(cols, args.min_games)
+    if trends:
+        print(f"\nPlayer trends (>= {args.min_games} games):")
+        ranked = sorted(trends.items(), key=lambda kv: kv[1]["slope_per_day"], reverse=True)
+        for name, t in ranked[:10]:
+            print(f"  {name:20} {t['games']:>6} games  mean {t['mean']:.2f}  {t['slope_per_day']:+.4f}/day")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""Question pairs DuplicateIndex must merge or keep apart
+
+    python -m benchmarks.dedup_cases
+
+Exits non-zero if any pair is judged wrongly.
+"""
+from __future__ import annotations
+import sys
+
+from dedup import DuplicateIndex
+from models import Question
+
+def _q(prompt, choices, answer_index=0):
+    return Question(prompt, choices, answer_index, "General Knowledge", "Easy")
+
+WORLD_CUPS = ["Italy", "Brazil", "Germany", "France"]
+
+# (name, first, second, duplicate?)
+CASES = [
+    ("reworded", _q("Which planet is known as the Red Planet?", ["Mars", "Venus", "Jupiter", "Saturn"]),
+     _q("What planet is known as the Red Planet?", ["Mars", "Saturn", "Venus", "Jupiter"]), True),
+    ("punctuation and case", _q("Who painted the Mona Lisa?", ["Leonardo da Vinci", "Michelangelo", "Raphael", "Titian"]),
+     _q("who painted the mona lisa", ["Titian", "Raphael", "Michelangelo", "Leonardo da Vinci"], 3), True),
+    ("same template, different sum", _q("What is 2+2?", ["4", "3", "5", "6"]),
+     _q("What is 2+3?", ["4", "5", "6", "3"], 1), False),
+    # Same wording and the same answer - only the year tells them apart
+    ("same template, different year", _q("Which country won the 1982 FIFA World Cup?", WORLD_CUPS),
+     _q("Which country won the 2006 FIFA World Cup?", WORLD_CUPS), False),
+]
+
+def main():
+    failed = 0
+    for name, first, second, duplicate in CASES:
+        index = DuplicateIndex()
+        index.add(first)
+        judged = second in index
+        if judged != duplicate:
+            failed += 1
+            print(f"FAIL {name}: expected {'duplicate' if duplicate else 'distinct'}")
+        else:
+            print(f"ok   {name}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,27 @@
+"""Throughput of the headless scoring engine
+
+    python -m benchmarks.headless [sessions] [questions_per_session]
+"""
+from __future__ import annotations
+import sys
+import time
+
+from engine import AccuracyBot, random_bot, run_sessions
+from quiz_final import load_fallback_questions
+
+def main(sessions=100_000, per_session=10):
+    questions = load_fallback_questions(per_session)
+    bots = [AccuracyBot(0.8, skip_rate=0.1, name="strong"), AccuracyBot(0.4, name="weak"), random_bot]
+
+    start = time.perf_counter()
+    summary = run_sessions(questions, bots, sessions, seed=1)
+    elapsed = time.perf_counter() - start
+
+    answered = sum(s["total"] for s in summary["category_stats"].values())
+    print(f"{sessions:,} sessions x {per_session} questions in {elapsed:.2f} s "
+          f"({sessions / elapsed:,.0f} sessions/s, {answered / elapsed:,.0f} answers/s)")
+    print(f"mean score {sum(summary['scores']) / sessions:.2f}/{per_session}")
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*args)
@@ -0,0 +1,69 @@
+"""Memory footprint of the question bank layouts
+
+Run from the repository root:
+
+    python -m benchmarks.memory [num_questions]
+"""
+from __future__ import annotations
+import gc
+import sys
+import tracemalloc
+
+from compact import CompactBank, CompactResult
+from fallback_questions import FALLBACK_QUESTIONS
+from models import Question, Result
+
+def synthetic_dicts(n):
+    """FALLBACK_QUESTIONS-style dicts with unique prompts, like a large import"""
+    base = FALLBACK_QUESTIONS
+    return [
+        {
+            "prompt": f"{base[i % len(base)]['prompt']} #{i}",
+            "choices": list(base[i % len(base)]["choices"]),
+            "answer_index": base[i % len(base)]["answer_index"],
+            "category": base[i % len(base)]["category"],
+            "difficulty": base[i % len(base)]["difficulty"],
+        }
+        for i in range(n)
+    ]
+
+def measure(build):
+    """Bytes still allocated by the object ``build`` returns"""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+def main(n=200_000):
+    # Each layout is built from its own fresh input so shared strings are counted
+    layouts = [
+        ("list of dicts (fallback_questions.py)", lambda: synthetic_dicts(n)),
+        ("list of Question dataclasses", lambda: [
+            Question(d["prompt"], d["choices"], d["answer_index"], d["category"], d["difficulty"])
+            for d in synthetic_dicts(n)
+        ]),
+        ("CompactBank (columnar)", lambda: CompactBank.from_dicts(synthetic_dicts(n))),
+    ]
+
+    print(f"{n:,} questions")
+    baseline = None
+    for name, build in layouts:
+        size = measure(build)
+        baseline = baseline or size
+        print(f"  {name:40} {size / 1e6:8.1f} MB  {size / n:6.0f} B/question  {size / baseline:5.0%}")
+
+    results = [Result(str(i), i % 50, 50, "2026-01-01 00:00:00", 12.5, None) for i in range(n)]
+    print(f"{n:,} results")
+    for name, build in [
+        ("list of Result dataclasses", lambda: [Result(r.player_name, r.score, r.max_score, r.date, r.total_time)
+                                                for r in results]),
+        ("list of CompactResult", lambda: [CompactResult.from_result(r) for r in results]),
+    ]:
+        size = measure(build)
+        print(f"  {name:40} {size / 1e6:8.1f} MB  {size / n:6.0f} B/result")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
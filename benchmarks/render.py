@@ -0,0 +1,55 @@
+"""Bytes written to the terminal per question, full redraw vs diff renderer
+
+    python -m benchmarks.render [questions]
+"""
+from __future__ import annotations
+import io
+import random
+import sys
+
+from rich.console import Console
+
+from render import DiffRenderer, FullRenderer, question_frame
+
+class CountingFile(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.bytes = 0
+
+    def write(self, s):
+        self.bytes += len(s.encode("utf-8"))
+        return super().write(s)
+
+def play(renderer_cls, questions):
+    out = CountingFile()
+    console = Console(file=out, force_terminal=True, width=100, height=40, color_system="truecolor")
+    renderer = renderer_cls(console)
+    score = 0
+    per_question = []
+    for i, q in enumerate(questions, 1):
+        before = out.bytes
+        renderer.show(question_frame(q, q.choices, i, len(questions), score))
+        # What ask_question prints under the frame: prompt echo and feedback
+        console.print("[bold white]Your answer (A/B/C/D/skip): [/bold white]B")
+        console.print("[green]✓ Correct! (+1 point)[/green]")
+        score += random.choice([1, -0.25])
+        per_question.append(out.bytes - before)
+    return per_question
+
+def main(n=20):
+    from quiz_final import load_fallback_questions
+
+    random.seed(0)
+    questions = load_fallback_questions(n)
+    full = play(FullRenderer, questions)
+    diff = play(DiffRenderer, questions)
+
+    # The first frame is a full draw either way; compare the steady state
+    full_avg = sum(full[1:]) / (n - 1)
+    diff_avg = sum(diff[1:]) / (n - 1)
+    print(f"{n} questions at 100x40, bytes written per question (after the first)")
+    print(f"  full redraw (console.clear) {full_avg:8.0f} B")
+    print(f"  diff renderer               {diff_avg:8.0f} B  ({diff_avg / full_avg:.0%} of full)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,71 @@
+"""Startup budget check for the game's entry module
+
+Measures the cumulative ``python -X importtime`` cost of ``quiz_final``
+(everything needed to draw the first menu) and fails if it exceeds the
+budget or if a module that is meant to load lazily was pulled in.
+
+    python -m benchmarks.startup [--budget-ms N] [--runs N]
+"""
+from __future__ import annotations
+import argparse
+import statistics
+import subprocess
+import sys
+
+STARTUP_BUDGET_MS = 100
+
+# Only needed once a game actually starts
+LAZY_MODULES = ("requests", "fallback_questions", "rich.table")
+
+PROBE = (
+    "import sys, quiz_final; "
+    f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+)
+
+def measure_once(module="quiz_final"):
+    """Return (cumulative import time in ms, eagerly loaded lazy modules)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True, text=True, check=True
+    )
+    cumulative_us = None
+    for line in proc.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative_us = int(parts[1])
+    if cumulative_us is None:
+        raise RuntimeError(f"{module} did not show up in -X importtime output")
+    eager = [m for m in proc.stdout.strip().split(",") if m]
+    return cumulative_us / 1000, eager
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    # Warm the bytecode cache so the first run is not an outlier
+    measure_once()
+    timings = []
+    eager = []
+    for _ in range(args.runs):
+        ms, eager = measure_once()
+        timings.append(ms)
+
+    median = statistics.median(timings)
+    print(f"import quiz_final: median {median:.1f} ms, min {min(timings):.1f} ms "
+          f"over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+
+    ok = True
+    if eager:
+        print(f"FAIL: loaded at startup but should be lazy: {', '.join(eager)}")
+        ok = False
+    if median > args.budget_ms:
+        print("FAIL: startup budget exceeded")
+        ok = False
+    if ok:
+        print("OK")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
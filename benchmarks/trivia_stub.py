@@ -0,0 +1,253 @@
+"""Local OpenTDB stub and checks for the HTTP client and session fetcher
+
+Runs a threaded api.php / api_token.php stand-in on localhost that can fail
+with 5xx, enforce OpenTDB's one-request-per-5-seconds rule and run out of
+questions, then drives TriviaClient / TriviaFetcher against it:
+
+    python -m benchmarks.trivia_stub
+
+Exits non-zero if any check fails.
+"""
+from __future__ import annotations
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from trivia_client import TriviaAPIError, TriviaClient, TriviaFetcher
+
+class StubState:
+    def __init__(self, questions=1000, fail_first=0, always_fail=False, rate_limit=0.0):
+        self.remaining = questions
+        self.fail_first = fail_first
+        self.always_fail = always_fail
+        self.rate_limit = rate_limit
+        self.requests = []          # (path, params, response_code or HTTP status)
+        self.connections = set()    # client (host, port) pairs seen
+        self.last_api_call = None
+        self.lock = threading.Lock()
+
+def _item(n, category, difficulty):
+    return {
+        "category": category or "General Knowledge",
+        "type": "multiple",
+        "difficulty": difficulty or "medium",
+        "question": f"Stub question {n}?",
+        "correct_answer": f"right {n}",
+        "incorrect_answers": [f"wrong {n}a", f"wrong {n}b", f"wrong {n}c"],
+    }
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so a reused session shows up as one connection
+    protocol_version = "HTTP/1.1"
+    state: StubState = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None):
+        payload = json.dumps(body or {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        state = self.state
+        with state.lock:
+            state.connections.add(self.client_address)
+            if state.always_fail or state.fail_first > 0:
+                state.fail_first -= 1
+                state.requests.append((url.path, params, 503))
+                return self._send(503)
+
+            if url.path.endswith("api_token.php"):
+                state.requests.append((url.path, params, 0))
+                return self._send(200, {"response_code": 0, "token": "stub-token"})
+
+            now = time.monotonic()
+            if state.rate_limit and state.last_api_call is not None \
+                    and now - state.last_api_call < state.rate_limit:
+                state.last_api_call = now
+                state.requests.append((url.path, params, 5))
+                return self._send(200, {"response_code": 5, "results": []})
+            state.last_api_call = now
+
+            amount = int(params.get("amount", 10))
+            if amount > state.remaining:
+                state.requests.append((url.path, params, 1))
+                return self._send(200, {"response_code": 1, "results": []})
+            start = state.remaining
+            state.remaining -= amount
+            state.requests.append((url.path, params, 0))
+            results = [_item(start - i, None, params.get("difficulty")) for i in range(amount)]
+        self._send(200, {"response_code": 0, "results": results})
+
+def serve(state: StubState):
+    """Start the stub on a free port; returns (server, base_url)"""
+    handler = type("Handler", (StubHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def _client(base, **kwargs):
+    kwargs.setdefault("backoff", 0.01)
+    kwargs.setdefault("max_backoff", 0.02)
+    return TriviaClient(base_url=f"{base}/api.php", connect_timeout=1, read_timeout=2, **kwargs)
+
+# ---------------- CHECKS ----------------
+
+def check_retries_on_5xx():
+    state = StubState(fail_first=2)
+    server, base = serve(state)
+    try:
+        client = _client(base)
+        data = client.get_json({"amount": 5})
+        assert data["response_code"] == 0, data
+        assert [r[2] for r in state.requests] == [503, 503, 0], state.requests
+        assert client.metrics[-1].attempts == 3
+    finally:
+        server.shutdown()
+
+def check_retry_budget():
+    state = StubState(always_fail=True)
+    server, base = serve(state)
+    try:
+        client = _client(base, max_retries=3, retry_budget=4, budget_refill=0)
+        for _ in range(3):
+            try:
+                client.get_json({"amount": 5})
+            except TriviaAPIError:
+                pass
+            else:
+                raise AssertionError("request against a failing server succeeded")
+        # 3 calls: 1 + 3 retries, then 1 + 1 (budget spent), then 1 with no retries
+        assert len(state.requests) == 7, len(state.requests)
+    finally:
+        server.shutdown()
+
+def check_session_reuse():
+    state = StubState()
+    server, base = serve(state)
+    try:
+        client = _client(base)
+        for _ in range(5):
+            client.get_json({"amount": 1})
+        assert len(state.requests) == 5
+        assert len(state.connections) == 1, state.connections
+    finally:
+        server.shutdown()
+
+def _fetcher(base, state, **kwargs):
+    client = _client(base)
+    return TriviaFetcher(client, token_url=f"{base}/api_token.php", rate_limit_wait=state.rate_limit, **kwargs)
+
+def check_short_pool_asks_for_needed():
+    state = StubState(questions=20, rate_limit=1.0)
+    server, base = serve(state)
+    try:
+        fetcher = _fetcher(base, state)
+        start = time.perf_counter()
+        questions = fetcher.fetch(10, 29, "hard")
+        elapsed = time.perf_counter() - start
+        api = [(r[1]["amount"], r[2]) for r in state.requests if r[0].endswith("api.php")]
+        # A full batch comes back empty, then exactly what is needed - no rate-limit hit
+        assert len(questions) == 10
+        assert api == [("50", 1), ("10", 0)], api
+        assert elapsed < 2 * state.rate_limit, elapsed
+    finally:
+        server.shutdown()
+
+def check_rate_limit_spacing():
+    state = StubState(rate_limit=1.0)
+    server, base = serve(state)
+    try:
+        fetcher = _fetcher(base, state)
+        for _ in range(3):
+            # Different settings each time, so every fetch needs a request
+            fetcher.fetch(10, None, ["easy", "medium", "hard"][fetcher.requests_made])
+        codes = [r[2] for r in state.requests if r[0].endswith("api.php")]
+        assert codes == [0, 0, 0], codes
+    finally:
+        server.shutdown()
+
+def _token_calls(state):
+    return sum(1 for r in state.requests if r[0].endswith("api_token.php"))
+
+def check_token_backoff():
+    state = StubState(always_fail=True)
+    server, base = serve(state)
+    try:
+        fetcher = _fetcher(base, state, max_attempts=1)
+        counts = []
+        for _ in range(3):
+            try:
+                fetcher.fetch(10)
+            except TriviaAPIError:
+                pass
+            counts.append(_token_calls(state))
+        # The first failure backs off - later pulls go straight to api.php
+        assert counts[0] > 0 and counts[0] == counts[-1], counts
+    finally:
+        server.shutdown()
+
+def check_no_wait_after_failure():
+    state = StubState(always_fail=True, rate_limit=1.0)
+    server, base = serve(state)
+    try:
+        fetcher = _fetcher(base, state, max_attempts=1)
+        for _ in range(2):
+            start = time.perf_counter()
+            try:
+                fetcher.fetch(10)
+            except TriviaAPIError:
+                pass
+            elapsed = time.perf_counter() - start
+        # No response ever came back, so there is no rate-limit window to sit out
+        assert elapsed < state.rate_limit, elapsed
+    finally:
+        server.shutdown()
+
+def check_pool_not_blocked_by_wait():
+    state = StubState(rate_limit=1.0)
+    server, base = serve(state)
+    try:
+        fetcher = _fetcher(base, state)
+        fetcher.fetch(10, None, "easy")
+        # This pull sits out the rate-limit window in the background
+        worker = threading.Thread(target=fetcher.fetch, args=(10, None, "hard"))
+        worker.start()
+        time.sleep(0.1)
+        start = time.perf_counter()
+        pooled = fetcher.take_pooled(10, None, "easy")
+        elapsed = time.perf_counter() - start
+        worker.join()
+        assert pooled and len(pooled) == 10
+        assert elapsed < 0.1, elapsed
+    finally:
+        server.shutdown()
+
+CHECKS = [check_retries_on_5xx, check_retry_budget, check_session_reuse,
+          check_short_pool_asks_for_needed, check_rate_limit_spacing, check_token_backoff,
+          check_no_wait_after_failure, check_pool_not_blocked_by_wait]
+
+def main():
+    failed = 0
+    for check in CHECKS:
+        start = time.perf_counter()
+        try:
+            check()
+        except AssertionError as e:
+            failed += 1
+            print(f"FAIL {check.__name__}: {e}")
+        else:
+            print(f"ok   {check.__name__} ({time.perf_counter() - start:.2f} s)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
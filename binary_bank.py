@@ -0,0 +1,231 @@
+"""Precompiled binary question bank read through mmap
+
+File layout (little-endian):
+
+    header        magic, version, counts and section offsets
+    strings       (n_strings + 1) u64 offsets, then the UTF-8 string data
+    records       fixed 32-byte records sorted by (category, difficulty):
+                  prompt, 4 choices, category and difficulty as string ids,
+                  answer index and choice count
+    groups        one entry per (category, difficulty): string ids and the
+                  first record / record count of its contiguous run
+    by_difficulty u32 record ids sorted by difficulty, plus one
+                  (difficulty, start, count) entry per difficulty
+
+Because records are grouped, every pool ``sample`` needs is a range of
+record ids or a slice of the difficulty index, so drawing N questions only
+reads N records and their strings.
+
+Compile the bank (and any OpenTDB JSON dumps) with:
+
+    python binary_bank.py compile questions.qbank [dump.json ...]
+"""
+from __future__ import annotations
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from dedup import DuplicateIndex
+from models import Question
+from question_bank import QuestionBank
+
+MAGIC = b"QBK1"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHIIIIQQQQQ")
+RECORD = struct.Struct("<IIIIIIIBB2x")
+GROUP = struct.Struct("<IIII")
+DIFFICULTY = struct.Struct("<III")
+
+# ---------------- COMPILER ----------------
+
+def load_source(path) -> List[Question]:
+    """Read questions from a JSON dump
+
+    Accepts OpenTDB API responses / exports (``{"results": [...]}`` or a list
+    of result items) and lists of FALLBACK_QUESTIONS-style dicts.
+    """
+    from trivia_client import parse_results
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    items = data.get("results", []) if isinstance(data, dict) else data
+
+    questions = []
+    opentdb_items = [item for item in items if "correct_answer" in item]
+    questions.extend(parse_results(opentdb_items))
+    for item in items:
+        if "prompt" in item:
+            questions.append(Question(
+                prompt=item["prompt"],
+                choices=item["choices"],
+                answer_index=item["answer_index"],
+                category=item.get("category", "General Knowledge"),
+                difficulty=item.get("difficulty", "Medium")
+            ))
+    return questions
+
+def compile_bank(questions: Iterable[Question], path) -> int:
+    """Write questions to ``path`` in the binary format, returns records written"""
+    strings: Dict[str, int] = {}
+
+    def sid(s):
+        s = s or ""
+        if s not in strings:
+            strings[s] = len(strings)
+        return strings[s]
+
+    # Only well-formed 4-choice questions, first of any near duplicates wins
+    seen = DuplicateIndex()
+    rows = []
+    for q in questions:
+        if len(q.choices) != 4 or not 0 <= q.answer_index < 4 or not seen.add(q):
+            continue
+        rows.append(q)
+    rows.sort(key=lambda q: (q.category or "", q.difficulty or ""))
+
+    records = bytearray()
+    groups: List[Tuple[int, int, int, int]] = []
+    by_difficulty: Dict[int, List[int]] = {}
+    for i, q in enumerate(rows):
+        cat, diff = sid(q.category), sid(q.difficulty)
+        records += RECORD.pack(sid(q.prompt), *(sid(c) for c in q.choices), cat, diff, q.answer_index, 4)
+        if groups and groups[-1][:2] == (cat, diff):
+            c, d, first, count = groups[-1]
+            groups[-1] = (c, d, first, count + 1)
+        else:
+            groups.append((cat, diff, i, 1))
+        by_difficulty.setdefault(diff, []).append(i)
+
+    blobs = [s.encode("utf-8") for s in strings]
+    offsets = [0]
+    for b in blobs:
+        offsets.append(offsets[-1] + len(b))
+
+    difficulty_ids = []
+    difficulty_table = bytearray()
+    for diff, ids in by_difficulty.items():
+        difficulty_table += DIFFICULTY.pack(diff, len(difficulty_ids), len(ids))
+        difficulty_ids.extend(ids)
+
+    string_offsets_at = HEADER.size
+    string_data_at = string_offsets_at + 8 * len(offsets)
+    records_at = string_data_at + offsets[-1]
+    groups_at = records_at + len(records)
+    difficulties_at = groups_at + GROUP.size * len(groups)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(rows), len(blobs), len(groups), len(by_difficulty),
+                            string_offsets_at, string_data_at, records_at, groups_at, difficulties_at))
+        f.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        for b in blobs:
+            f.write(b)
+        f.write(records)
+        for g in groups:
+            f.write(GROUP.pack(*g))
+        f.write(difficulty_table)
+        f.write(struct.pack(f"<{len(difficulty_ids)}I", *difficulty_ids))
+    os.replace(tmp_path, path)
+    return len(rows)
+
+# ---------------- READER ----------------
+
+class BinaryBank(QuestionBank):
+    """QuestionBank served straight from a compiled file through mmap"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, _, self._n_records, n_strings, n_groups, n_difficulties,
+         string_offsets_at, self._string_data_at, self._records_at,
+         groups_at, difficulties_at) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} question bank")
+
+        self._view = view = memoryview(self._mm)
+        self._string_offsets = view[string_offsets_at:string_offsets_at + 8 * (n_strings + 1)].cast("Q")
+
+        # The group tables are tiny, so they are decoded up front
+        self._by_key: Dict[Tuple[str, str], range] = {}
+        self._by_category: Dict[str, range] = {}
+        for i in range(n_groups):
+            cat, diff, first, count = GROUP.unpack_from(self._mm, groups_at + i * GROUP.size)
+            cat, diff = self._string(cat), self._string(diff)
+            self._by_key[(cat, diff)] = range(first, first + count)
+            # Records are sorted by category, so a category is one contiguous run
+            start = self._by_category[cat].start if cat in self._by_category else first
+            self._by_category[cat] = range(start, first + count)
+
+        ids_at = difficulties_at + DIFFICULTY.size * n_difficulties
+        self._by_difficulty: Dict[str, Sequence[int]] = {}
+        for i in range(n_difficulties):
+            diff, start, count = DIFFICULTY.unpack_from(self._mm, difficulties_at + i * DIFFICULTY.size)
+            begin = ids_at + 4 * start
+            self._by_difficulty[self._string(diff)] = view[begin:begin + 4 * count].cast("I")
+
+    def __len__(self):
+        return self._n_records
+
+    def close(self):
+        # Every view into the map has to be released before it can close
+        for ids in self._by_difficulty.values():
+            ids.release()
+        self._by_difficulty.clear()
+        self._string_offsets.release()
+        self._view.release()
+        self._mm.close()
+
+    def _string(self, sid) -> str:
+        start = self._string_data_at + self._string_offsets[sid]
+        end = self._string_data_at + self._string_offsets[sid + 1]
+        return self._mm[start:end].decode("utf-8")
+
+    def _all_ids(self):
+        return range(self._n_records)
+
+    def _get(self, i) -> Question:
+        prompt, c0, c1, c2, c3, cat, diff, answer, _ = RECORD.unpack_from(
+            self._mm, self._records_at + i * RECORD.size
+        )
+        return Question(
+            prompt=self._string(prompt),
+            choices=[self._string(c) for c in (c0, c1, c2, c3)],
+            answer_index=answer,
+            category=self._string(cat),
+            difficulty=self._string(diff)
+        )
+
+# ---------------- CLI ----------------
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile the offline question bank to a binary file")
+    sub = parser.add_subparsers(dest="command", required=True)
+    compile_cmd = sub.add_parser("compile", help="compile fallback_questions.py plus any JSON dumps")
+    compile_cmd.add_argument("output")
+    compile_cmd.add_argument("sources", nargs="*", help="OpenTDB JSON dumps or question dict lists")
+    compile_cmd.add_argument("--no-fallback", action="store_true",
+                             help="leave out the built-in fallback_questions.py bank")
+    args = parser.parse_args(argv)
+
+    questions: List[Question] = []
+    if not args.no_fallback:
+        from compact import CompactBank
+        from fallback_questions import FALLBACK_QUESTIONS
+        questions.extend(CompactBank.from_dicts(FALLBACK_QUESTIONS).to_questions())
+    for source in args.sources:
+        questions.extend(load_source(source))
+
+    written = compile_bank(questions, args.output)
+    print(f"Wrote {written} questions to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
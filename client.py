@@ -0,0 +1,154 @@
+"""Terminal client for server.py - play a networked match from the console
+
+    python server.py &
+    python client.py --room friday --name alice
+
+Everyone in the room sees the same question at the same time. Type A-D
+(or 'skip') while a question is open; in the lobby, Enter starts the match
+for the whole room.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import sys
+import threading
+from types import SimpleNamespace
+from typing import List, Optional
+
+from rich import box
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from render import question_frame
+
+LETTERS = "abcd"
+
+def _read_stdin(loop: asyncio.AbstractEventLoop, lines: asyncio.Queue):
+    """Feed stdin lines to the event loop; None marks end of input"""
+    for line in iter(sys.stdin.readline, ""):
+        loop.call_soon_threadsafe(lines.put_nowait, line)
+    loop.call_soon_threadsafe(lines.put_nowait, None)
+
+def _scores_table(scores, title) -> Table:
+    table = Table(title=title, box=box.ROUNDED)
+    table.add_column("Rank", justify="center")
+    table.add_column("Player", style="cyan")
+    table.add_column("Score", style="yellow")
+    for i, (name, score) in enumerate(scores, 1):
+        table.add_row(str(i), name, f"{score:g}")
+    return table
+
+async def play(host, port, room, name, console: Optional[Console] = None) -> Optional[List[list]]:
+    """Join ``room`` and play one match; returns the final scores, or None if it never finished"""
+    console = console or Console()
+    reader, writer = await asyncio.open_connection(host, port)
+    loop = asyncio.get_running_loop()
+    lines: asyncio.Queue = asyncio.Queue()
+    # Blocking reads live on their own thread so server messages keep flowing
+    threading.Thread(target=_read_stdin, args=(loop, lines), daemon=True).start()
+
+    match = SimpleNamespace(joined=False, started=False, question=None, open=False,
+                            answered=False, score=0)
+
+    def send(message):
+        writer.write((json.dumps(message) + "\n").encode())
+
+    async def handle_input():
+        while True:
+            line = await lines.get()
+            if line is None:
+                return
+            text = line.strip().lower()
+            if not match.open:
+                if match.joined and not match.started and text in ("", "start"):
+                    send({"type": "start"})
+                    await writer.drain()
+                continue
+            if text == "skip":
+                choice = None
+            elif len(text) == 1 and text in LETTERS[:len(match.question["choices"])]:
+                choice = LETTERS.index(text)
+            else:
+                console.print("[red]Invalid input! Please enter A, B, C, D, or 'skip'[/red]")
+                continue
+            send({"type": "answer", "index": match.question["index"], "choice": choice})
+            await writer.drain()
+            match.open, match.answered = False, True
+            console.print("[dim]Answer locked in - waiting for the others...[/dim]")
+
+    send({"type": "join", "room": room, "name": name})
+    await writer.drain()
+    inputs = asyncio.ensure_future(handle_input())
+    try:
+        async for raw in reader:
+            msg = json.loads(raw)
+            kind = msg.get("type")
+            if kind == "joined":
+                match.joined = True
+                console.print(f"[cyan]Room {msg['room']}:[/cyan] {', '.join(msg['players'])}")
+                if not match.started:
+                    console.print("[dim]Press Enter to start once everyone is in[/dim]")
+            elif kind == "question":
+                match.started = True
+                match.question, match.open, match.answered = msg, True, False
+                q = SimpleNamespace(prompt=msg["prompt"], category=msg["category"],
+                                    difficulty=msg["difficulty"])
+                console.clear()
+                console.print(question_frame(q, msg["choices"], msg["index"] + 1, msg["total"], match.score))
+                console.print(f"[yellow]Your answer (A/B/C/D or skip) - {msg['deadline']:g}s:[/yellow]")
+            elif kind == "result":
+                match.open = False
+                match.score = msg["score"]
+                choices = match.question["choices"]
+                correct = f"{LETTERS[msg['correct_choice']].upper()}: {choices[msg['correct_choice']]}"
+                if msg["choice"] == msg["correct_choice"]:
+                    console.print(f"[green]Correct! +{msg['points']:g} points[/green]")
+                elif msg["choice"] is None:
+                    console.print(f"[yellow]{'Skipped' if match.answered else 'Time is up'}! "
+                                  f"Correct answer was {correct}[/yellow]")
+                else:
+                    console.print(f"[red]Wrong! Correct answer was {correct} ({msg['points']:g} points)[/red]")
+            elif kind == "leaderboard":
+                console.print(_scores_table(msg["scores"], "Leaderboard"))
+            elif kind == "end":
+                console.print(Panel("🏆 Final Standings", style="bold magenta"))
+                console.print(_scores_table(msg["scores"], None))
+                return msg["scores"]
+            elif kind == "error":
+                console.print(f"[red]{msg['message']}[/red]")
+                if not match.joined:
+                    return None
+        console.print("[red]Disconnected from the server.[/red]")
+        return None
+    finally:
+        inputs.cancel()
+        writer.close()
+
+# ---------------- CLI ----------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Join a multiplayer quiz server from the terminal")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--room", default="lobby")
+    parser.add_argument("--name", help="prompted for if not given")
+    args = parser.parse_args(argv)
+
+    console = Console()
+    name = args.name
+    while not name:
+        name = console.input("[bold yellow]Enter your name: [/bold yellow]").strip()
+
+    try:
+        scores = asyncio.run(play(args.host, args.port, args.room, name, console))
+    except OSError as e:
+        console.print(f"[red]Could not reach {args.host}:{args.port} ({e})[/red]")
+        return 1
+    except KeyboardInterrupt:
+        return 1
+    return 0 if scores is not None else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+from __future__ import annotations
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+from models import Question, Result
+
+# ---------------- COMPACT STORAGE ----------------
+
+class CodeTable:
+    """Interns repeated labels (categories, difficulties) as small int codes"""
+    __slots__ = ("names", "_codes")
+
+    def __init__(self, names: Iterable[str] = ()):
+        self.names: List[Optional[str]] = []
+        self._codes: Dict[Optional[str], int] = {}
+        for name in names:
+            self.code(name)
+
+    def code(self, name: Optional[str]) -> int:
+        code = self._codes.get(name)
+        if code is None:
+            code = len(self.names)
+            if code > 255:
+                raise ValueError("CodeTable holds at most 256 labels")
+            self._codes[name] = code
+            self.names.append(name)
+        return code
+
+    def lookup(self, name: Optional[str]) -> Optional[int]:
+        return self._codes.get(name)
+
+    def name(self, code: int) -> Optional[str]:
+        return self.names[code]
+
+    def __len__(self):
+        return len(self.names)
+
+class CompactQuestion:
+    """Slotted question with interned category and difficulty codes"""
+    __slots__ = ("prompt", "choices", "answer_index", "category_code", "difficulty_code", "_tables")
+
+    def __init__(self, prompt, choices, answer_index, category_code, difficulty_code, tables):
+        self.prompt = prompt
+        self.choices = tuple(choices)
+        self.answer_index = answer_index
+        self.category_code = category_code
+        self.difficulty_code = difficulty_code
+        self._tables = tables
+
+    @property
+    def category(self):
+        return self._tables[0].name(self.category_code)
+
+    @property
+    def difficulty(self):
+        return self._tables[1].name(self.difficulty_code)
+
+    def to_question(self) -> Question:
+        return Question(
+            prompt=self.prompt,
+            choices=list(self.choices),
+            answer_index=self.answer_index,
+            category=self.category,
+            difficulty=self.difficulty
+        )
+
+class CompactResult:
+    """Slotted Result - same fields, no per-instance __dict__"""
+    __slots__ = ("player_name", "score", "max_score", "date", "total_time", "category_stats",
+                 "feedback_time", "question_times", "answer_time")
+
+    def __init__(self, player_name, score, max_score, date, total_time=None, category_stats=None,
+                 feedback_time=None, question_times=None, answer_time=None):
+        self.player_name = player_name
+        self.score = score
+        self.max_score = max_score
+        self.date = date
+        self.total_time = total_time
+        self.category_stats = category_stats
+        self.feedback_time = feedback_time
+        # Per-question times as a float array rather than a list of floats
+        self.question_times = None if question_times is None else array("d", question_times)
+        self.answer_time = answer_time
+
+    @classmethod
+    def from_result(cls, result: Result):
+        return cls(result.player_name, result.score, result.max_score, result.date,
+                   result.total_time, result.category_stats, result.feedback_time,
+                   result.question_times, result.answer_time)
+
+    def to_result(self) -> Result:
+        return Result(self.player_name, self.score, self.max_score, self.date,
+                      self.total_time, self.category_stats, self.feedback_time,
+                      None if self.question_times is None else list(self.question_times),
+                      self.answer_time)
+
+class CompactBank:
+    """Columnar question storage for very large banks
+
+    Each column is a flat list or ``array``: prompts, the choices of every
+    question laid end to end (with an offset column), answer indexes and
+    one-byte category / difficulty codes. A question costs a few machine
+    words plus its strings, instead of a dict or dataclass per question.
+    """
+
+    def __init__(self):
+        self.categories = CodeTable()
+        self.difficulties = CodeTable()
+        self.prompts: List[str] = []
+        self.choices: List[str] = []
+        self.choice_offsets = array("I", [0])
+        self.answers = array("b")
+        self.category_codes = array("B")
+        self.difficulty_codes = array("B")
+
+    def __len__(self):
+        return len(self.prompts)
+
+    def append(self, prompt, choices, answer_index, category=None, difficulty="Medium") -> int:
+        """Add one question and return its row id"""
+        row = len(self.prompts)
+        self.prompts.append(prompt)
+        # Short answers ("True", "1990", ...) repeat a lot across a bank
+        self.choices.extend(sys.intern(c) for c in choices)
+        self.choice_offsets.append(len(self.choices))
+        self.answers.append(answer_index)
+        self.category_codes.append(self.categories.code(category))
+        self.difficulty_codes.append(self.difficulties.code(difficulty))
+        return row
+
+    def add_question(self, q: Question) -> int:
+        return self.append(q.prompt, q.choices, q.answer_index, q.category, q.difficulty)
+
+    @classmethod
+    def from_questions(cls, questions: Iterable[Question]):
+        bank = cls()
+        for q in questions:
+            bank.add_question(q)
+        return bank
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[dict]):
+        """Build from FALLBACK_QUESTIONS-style dicts"""
+        bank = cls()
+        for item in items:
+            bank.append(
+                item["prompt"],
+                item["choices"],
+                item["answer_index"],
+                item.get("category", "General Knowledge"),
+                item.get("difficulty", "Medium")
+            )
+        return bank
+
+    def row_choices(self, row) -> List[str]:
+        return self.choices[self.choice_offsets[row]:self.choice_offsets[row + 1]]
+
+    def category(self, row) -> Optional[str]:
+        return self.categories.name(self.category_codes[row])
+
+    def difficulty(self, row) -> Optional[str]:
+        return self.difficulties.name(self.difficulty_codes[row])
+
+    def compact(self, row) -> CompactQuestion:
+        return CompactQuestion(
+            self.prompts[row],
+            self.row_choices(row),
+            self.answers[row],
+            self.category_codes[row],
+            self.difficulty_codes[row],
+            (self.categories, self.difficulties)
+        )
+
+    def question(self, row) -> Question:
+        """Materialise one row as a regular Question"""
+        return Question(
+            prompt=self.prompts[row],
+            choices=self.row_choices(row),
+            answer_index=self.answers[row],
+            category=self.category(row),
+            difficulty=self.difficulty(row)
+        )
+
+    def __getitem__(self, row) -> Question:
+        return self.question(row)
+
+    def to_questions(self) -> List[Question]:
+        return [self.question(row) for row in range(len(self))]
@@ -0,0 +1,172 @@
+"""Near-duplicate question detection
+
+Two layers, both checked in constant time per question:
+
+* an exact fingerprint - a 64-bit hash of the normalized prompt plus the
+  sorted, normalized choices - catches reworded punctuation, case,
+  spacing and shuffled choices
+* a MinHash signature of the prompt's character 3-grams, split into LSH
+  bands, catches rewordings ("Which planet..." / "What planet..."); only
+  questions sharing a band, the correct answer and every number in the
+  prompt are compared, so "What is 2+2?" and "What is 2+3?" stay apart,
+  and so do the 1982 and 2006 World Cup winners when both were Italy
+
+The signature uses one-permutation hashing (one hash per shingle, binned),
+so building it costs a single pass over the prompt.
+"""
+from __future__ import annotations
+import hashlib
+import re
+import threading
+import unicodedata
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models import Question
+
+NUM_BINS = 32
+BANDS = 16
+ROWS = NUM_BINS // BANDS
+EMPTY = 0xFFFFFFFF
+
+_NON_WORD = re.compile(r"[\W_]+")
+_NUMBER = re.compile(r"\d+")
+
+# ---------------- FINGERPRINTS ----------------
+
+def normalize(text: str) -> str:
+    """Casefolded words only - accents, punctuation and spacing dropped"""
+    text = text.casefold()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    return _NON_WORD.sub(" ", text).strip()
+
+def fingerprint(prompt: str, choices: Iterable[str]) -> int:
+    """Signed 64-bit hash of the normalized prompt and choice set"""
+    return _fingerprint(normalize(prompt), [normalize(c) for c in choices])
+
+def _fingerprint(prompt: str, choices: List[str]) -> int:
+    text = "\0".join([prompt] + sorted(choices))
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+def signature(prompt: str) -> Optional[Tuple[int, ...]]:
+    """MinHash signature of the prompt's character 3-grams (None if too short)"""
+    return _signature(normalize(prompt))
+
+def _signature(prompt: str) -> Optional[Tuple[int, ...]]:
+    data = prompt.encode("utf-8")
+    mins = [EMPTY] * NUM_BINS
+    for h in map(zlib.crc32, [data[i:i + 3] for i in range(len(data) - 2)]):
+        b, v = h % NUM_BINS, h // NUM_BINS
+        if v < mins[b]:
+            mins[b] = v
+    if len(data) < 3:
+        return None
+
+    # Densify: an empty bin borrows from the next filled one round the ring,
+    # so short prompts still agree bin-for-bin with their near duplicates
+    sig = list(mins)
+    nearest, distance = EMPTY, 0
+    for b in range(2 * NUM_BINS - 1, -1, -1):
+        v = mins[b % NUM_BINS]
+        if v != EMPTY:
+            nearest, distance = v, 0
+        else:
+            distance += 1
+            if b < NUM_BINS:
+                sig[b] = nearest + distance * (EMPTY // NUM_BINS)
+    return tuple(sig)
+
+def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(a, b)) / NUM_BINS
+
+# ---------------- INDEX ----------------
+
+class DuplicateIndex:
+    """Set-like index of questions that also matches near duplicates
+
+    ``add`` returns False (and indexes nothing) when the question is an
+    exact or near duplicate of one already added. Safe to share between
+    the game loop and the prefetch thread.
+    """
+
+    def __init__(self, threshold=0.6):
+        self.threshold = threshold
+        self._exact: Dict[int, int] = {}
+        self._bands: Dict[Tuple[int, int], List[int]] = {}
+        self._signatures: List[Optional[Tuple[int, ...]]] = []
+        # (answer, numbers in the prompt) - near duplicates must agree on both
+        self._anchors: List[Tuple[str, Tuple[str, ...]]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def __contains__(self, q: Question):
+        return self.find(q) is not None
+
+    @staticmethod
+    def _band_keys(sig, anchor) -> Iterator[Tuple[int, int]]:
+        # The anchor is part of every bucket key, so templated prompts
+        # ("What is 2+2?", "What is 2+3?") never pile into one bucket
+        for band in range(BANDS):
+            yield band, hash((anchor,) + sig[band * ROWS:(band + 1) * ROWS])
+
+    def _match(self, fp, sig, anchor) -> Optional[int]:
+        if fp in self._exact:
+            return self._exact[fp]
+        if sig is None:
+            return None
+        checked = set()
+        for key in self._band_keys(sig, anchor):
+            for i in self._bands.get(key, ()):
+                if i in checked:
+                    continue
+                checked.add(i)
+                if self._anchors[i] == anchor and similarity(sig, self._signatures[i]) >= self.threshold:
+                    return i
+        return None
+
+    @staticmethod
+    def _features(q: Question):
+        prompt = normalize(q.prompt)
+        choices = [normalize(c) for c in q.choices]
+        answer = choices[q.answer_index] if 0 <= q.answer_index < len(choices) else ""
+        # Years and counts are short, so one template with a different year
+        # scores as a near duplicate on the prompt alone
+        anchor = (answer, tuple(_NUMBER.findall(prompt)))
+        return _fingerprint(prompt, choices), _signature(prompt), anchor
+
+    def find(self, q: Question) -> Optional[int]:
+        """Position of the question ``q`` duplicates, or None"""
+        features = self._features(q)
+        with self._lock:
+            return self._match(*features)
+
+    def add(self, q: Question) -> bool:
+        """Index ``q`` unless it duplicates an indexed question"""
+        fp, sig, anchor = self._features(q)
+        with self._lock:
+            if self._match(fp, sig, anchor) is not None:
+                return False
+            i = len(self._signatures)
+            self._exact[fp] = i
+            self._signatures.append(sig)
+            self._anchors.append(anchor)
+            if sig is not None:
+                for key in self._band_keys(sig, anchor):
+                    self._bands.setdefault(key, []).append(i)
+            return True
+
+    def update(self, questions: Iterable[Question]) -> int:
+        """Index several questions, returning how many were new"""
+        return sum(self.add(q) for q in questions)
+
+    def clear(self):
+        with self._lock:
+            self._exact.clear()
+            self._bands.clear()
+            self._signatures.clear()
+            self._anchors.clear()
@@ -0,0 +1,138 @@
+from __future__ import annotations
+import datetime
+import random
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from models import Question, Result
+
+# Points lost for a wrong answer when negative marking is on
+NEGATIVE_MARK = 0.25
+
+# ---------------- SCORING ENGINE ----------------
+
+@dataclass
+class Outcome:
+    correct: bool
+    skipped: bool
+    points: float
+
+class ScoreKeeper:
+    """Scoring state for one player, with no rendering or input
+
+    ``QuizGame`` drives it from the terminal; bots and simulators drive it
+    directly. ``choice`` is an index into ``Question.choices`` (before any
+    display shuffle), or None for a skip.
+    """
+
+    def __init__(self, negative_marking=False, penalty=NEGATIVE_MARK):
+        self.negative_marking = negative_marking
+        self.penalty = penalty
+        self.score = 0
+        self.answered = 0
+        self.category_stats: Dict[str, Dict[str, int]] = {}
+
+    def answer(self, q: Question, choice: Optional[int]) -> Outcome:
+        stats = self.category_stats.get(q.category)
+        if stats is None:
+            stats = self.category_stats[q.category] = {"correct": 0, "total": 0}
+        stats["total"] += 1
+        self.answered += 1
+
+        if choice is None:
+            return Outcome(correct=False, skipped=True, points=0)
+
+        if choice == q.answer_index:
+            self.score += 1
+            stats["correct"] += 1
+            return Outcome(correct=True, skipped=False, points=1)
+
+        points = -self.penalty if self.negative_marking else 0
+        self.score += points
+        return Outcome(correct=False, skipped=False, points=points)
+
+    def result(self, player_name, max_score, date=None, total_time=None) -> Result:
+        return Result(
+            player_name=player_name,
+            score=self.score,
+            max_score=max_score,
+            date=date or datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            total_time=total_time,
+            category_stats=self.category_stats
+        )
+
+# ---------------- BOTS ----------------
+
+# A bot maps (question, rng) to a choice index, or None to skip
+Bot = Callable[[Question, random.Random], Optional[int]]
+
+class AccuracyBot:
+    """Answers correctly with a fixed probability, optionally per category"""
+
+    def __init__(self, accuracy=0.7, skip_rate=0.0, category_accuracy=None, category_skip_rate=None,
+                 name="bot"):
+        self.accuracy = accuracy
+        self.skip_rate = skip_rate
+        self.category_accuracy = category_accuracy or {}
+        self.category_skip_rate = category_skip_rate or {}
+        self.name = name
+
+    def __call__(self, q: Question, rng: random.Random) -> Optional[int]:
+        if rng.random() < self.category_skip_rate.get(q.category, self.skip_rate):
+            return None
+        if rng.random() < self.category_accuracy.get(q.category, self.accuracy):
+            return q.answer_index
+        # Pick one of the wrong answers uniformly
+        wrong = rng.randrange(len(q.choices) - 1)
+        return wrong if wrong < q.answer_index else wrong + 1
+
+def random_bot(q: Question, rng: random.Random) -> Optional[int]:
+    return rng.randrange(len(q.choices))
+
+def perfect_bot(q: Question, rng: random.Random) -> Optional[int]:
+    return q.answer_index
+
+# ---------------- BATCH RUNS ----------------
+
+def play_session(questions: Sequence[Question], bot: Bot, rng: random.Random,
+                 negative_marking=True) -> ScoreKeeper:
+    """Play one whole game with no sleeps, rendering or input"""
+    keeper = ScoreKeeper(negative_marking)
+    for q in questions:
+        keeper.answer(q, bot(q, rng))
+    return keeper
+
+def merge_category_stats(into: Dict[str, Dict[str, int]], stats: Dict[str, Dict[str, int]]):
+    """Add one game's category_stats to a running total"""
+    for category, s in stats.items():
+        total = into.get(category)
+        if total is None:
+            into[category] = {"correct": s["correct"], "total": s["total"]}
+        else:
+            total["correct"] += s["correct"]
+            total["total"] += s["total"]
+    return into
+
+def run_sessions(questions: Sequence[Question], bots: Iterable[Bot], sessions: int,
+                 negative_marking=True, seed=None, keep_results=False):
+    """Play ``sessions`` games round-robin across ``bots`` in a tight loop
+
+    Returns a dict with the score of every session, the merged
+    category_stats and, if ``keep_results``, a Result per session.
+    """
+    rng = random.Random(seed)
+    bots = list(bots)
+    date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    scores: List[float] = []
+    category_stats: Dict[str, Dict[str, int]] = {}
+    results: List[Result] = []
+
+    for i in range(sessions):
+        bot = bots[i % len(bots)]
+        keeper = play_session(questions, bot, rng, negative_marking)
+        scores.append(keeper.score)
+        merge_category_stats(category_stats, keeper.category_stats)
+        if keep_results:
+            results.append(keeper.result(getattr(bot, "name", f"bot{i % len(bots)}"), len(questions), date))
+
+    return {"scores": scores, "category_stats": category_stats, "results": results}
@@ -0,0 +1,202 @@
+"""Append-only binary log of every answer
+
+File layout (little-endian): a 16-byte header - magic, version, record
+size - followed by fixed 24-byte records:
+
+    question_id  i64  dedup.fingerprint of the question (the question
+                      store's ``key``, so events join straight back to it)
+    chosen       i8   index into Question.choices, -1 for a skip
+    correct      i8   Question.answer_index
+    (padding)    2 bytes
+    latency      f32  seconds from question shown to valid answer
+    timestamp    f64  unix time of the answer
+
+Appends pack into a preallocated buffer that is written out in one call
+when it fills or the game ends, so the game loop never waits on the disk.
+Readers map the file and decode records in place; ``columns`` hands the
+whole log to NumPy without a copy.
+
+    python eventlog.py answers.qlog
+"""
+from __future__ import annotations
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from typing import Iterator, NamedTuple, Optional
+
+from dedup import fingerprint
+from engine import Outcome
+from models import Question
+
+MAGIC = b"QEV1"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHH8x")
+RECORD = struct.Struct("<qbb2xfd")
+
+class Event(NamedTuple):
+    question_id: int
+    chosen: int
+    correct: int
+    latency: float
+    timestamp: float
+
+    @property
+    def skipped(self):
+        return self.chosen < 0
+
+    @property
+    def is_correct(self):
+        return self.chosen == self.correct
+
+# ---------------- WRITER ----------------
+
+class EventWriter:
+    """Buffered appender - ``record`` is a QuizGame answer listener"""
+
+    def __init__(self, path, buffer_records=4096):
+        self.path = path
+        self._buffer = bytearray(RECORD.size * buffer_records)
+        self._used = 0
+        self._lock = threading.Lock()
+        # Question ids are cached per question object - hashing is the costly part
+        self._ids = {}
+
+    def append(self, question_id, chosen, correct, latency, timestamp=None):
+        with self._lock:
+            if self._used == len(self._buffer):
+                self._flush()
+            RECORD.pack_into(self._buffer, self._used, question_id, chosen, correct, latency,
+                             time.time() if timestamp is None else timestamp)
+            self._used += RECORD.size
+
+    def question_id(self, q: Question) -> int:
+        key = id(q)
+        cached = self._ids.get(key)
+        if cached is None or cached[0] is not q:
+            cached = self._ids[key] = (q, fingerprint(q.prompt, q.choices))
+        return cached[1]
+
+    def record(self, q: Question, choice: Optional[int], outcome: Outcome, response_time=None):
+        self.append(
+            self.question_id(q),
+            -1 if choice is None else choice,
+            q.answer_index,
+            math.nan if response_time is None else response_time
+        )
+
+    def _flush(self):
+        if not self._used:
+            return
+        with open(self.path, "ab+") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < HEADER.size:
+                # New file, or one torn inside the header - start it afresh
+                f.truncate(0)
+                f.write(HEADER.pack(MAGIC, VERSION, RECORD.size))
+            else:
+                f.seek(0)
+                magic, version, record_size = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+                    raise ValueError(f"{self.path} is not a version {VERSION} answer log")
+                # Drop a torn final record so new ones stay on the record grid
+                whole = HEADER.size + (size - HEADER.size) // RECORD.size * RECORD.size
+                if whole != size:
+                    f.truncate(whole)
+            f.write(memoryview(self._buffer)[:self._used])
+        self._used = 0
+
+    def flush(self):
+        """Write buffered records out in one append"""
+        with self._lock:
+            self._flush()
+            # Games are short; the cache only needs to outlive one
+            self._ids.clear()
+
+    close = flush
+
+# ---------------- READER ----------------
+
+class EventLog:
+    """Read-only view of a log file through mmap"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} answer log")
+        # A torn final record (crash mid-append) is ignored
+        self._n = (len(self._mm) - HEADER.size) // RECORD.size
+        self._view = memoryview(self._mm)[HEADER.size:HEADER.size + self._n * RECORD.size]
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i) -> Event:
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        return Event(*RECORD.unpack_from(self._view, i * RECORD.size))
+
+    def __iter__(self) -> Iterator[Event]:
+        for fields in RECORD.iter_unpack(self._view):
+            yield Event(*fields)
+
+    def columns(self):
+        """The log as a NumPy structured array sharing the mapped memory
+
+        Drop the array before ``close`` - a live view keeps the map open.
+        """
+        import numpy as np
+        dtype = np.dtype([
+            ("question_id", "<i8"), ("chosen", "i1"), ("correct", "i1"), ("_pad", "V2"),
+            ("latency", "<f4"), ("timestamp", "<f8")
+        ])
+        return np.frombuffer(self._view, dtype=dtype)
+
+    def close(self):
+        self._view.release()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+# ---------------- CLI ----------------
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarise an answer event log")
+    parser.add_argument("path", nargs="?", default="answers.qlog")
+    args = parser.parse_args(argv)
+
+    with EventLog(args.path) as log:
+        total = len(log)
+        correct = skipped = 0
+        latencies = []
+        for event in log:
+            correct += event.is_correct
+            skipped += event.skipped
+            if not math.isnan(event.latency):
+                latencies.append(event.latency)
+
+    print(f"{total} answers in {args.path}")
+    if total:
+        latencies.sort()
+        median = latencies[len(latencies) // 2] if latencies else math.nan
+        print(f"correct {correct / total:.1%}  skipped {skipped / total:.1%}  median latency {median:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
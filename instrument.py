@@ -0,0 +1,76 @@
+from __future__ import annotations
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict
+
+# ---------------- INSTRUMENTATION ----------------
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+class Profiler:
+    """Per-phase timings (fetch, render, input, scoring) for a session
+
+    Totals and counts are exact; quantiles come from the most recent
+    ``window`` samples of each phase.
+    """
+
+    def __init__(self, window=1000):
+        self.window = window
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self.samples: Dict[str, Deque[float]] = {}
+
+    def record(self, phase, seconds):
+        self.totals[phase] = self.totals.get(phase, 0.0) + seconds
+        self.counts[phase] = self.counts.get(phase, 0) + 1
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    @contextmanager
+    def span(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start)
+
+    def summary(self):
+        out = {}
+        for phase, total in self.totals.items():
+            ordered = sorted(self.samples[phase])
+            out[phase] = {
+                "count": self.counts[phase],
+                "total": total,
+                "mean": total / self.counts[phase],
+                "max": ordered[-1],
+                "quantiles": {
+                    str(q): ordered[min(len(ordered) - 1, int(q * len(ordered)))] for q in QUANTILES
+                },
+            }
+        return out
+
+    def to_json(self):
+        return json.dumps(self.summary(), indent=2)
+
+    def to_prometheus(self, name="quiz_phase_seconds"):
+        """Prometheus text exposition format, one summary labelled by phase"""
+        lines = [
+            f"# HELP {name} Time spent in each phase of a quiz session.",
+            f"# TYPE {name} summary",
+        ]
+        for phase, s in self.summary().items():
+            for q, value in s["quantiles"].items():
+                lines.append(f'{name}{{phase="{phase}",quantile="{q}"}} {value:.6f}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {s["total"]:.6f}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {s["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def export(self, path):
+        """Write the profile; ``.prom`` / ``.txt`` get Prometheus text, anything else JSON"""
+        text = self.to_prometheus() if path.endswith((".prom", ".txt")) else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+import json
+from typing import Any, Iterator
+
+# ---------------- STREAMING JSON ----------------
+
+_decoder = json.JSONDecoder()
+_SKIP = " \t\r\n,"
+
+def iter_json_array(path, chunk_size=1 << 16) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array one at a time
+
+    Only the item being decoded is held in memory, so arbitrarily large
+    exports can be scanned in constant space.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        started = False
+        eof = False
+
+        while True:
+            # Skip separators between items
+            while pos < len(buf) and buf[pos] in _SKIP:
+                pos += 1
+
+            if pos < len(buf):
+                if not started:
+                    if buf[pos] != "[":
+                        raise ValueError(f"{path} does not contain a JSON array")
+                    started = True
+                    pos += 1
+                    continue
+                if buf[pos] == "]":
+                    return
+                try:
+                    item, end = _decoder.raw_decode(buf, pos)
+                    # A value touching the end of the buffer may be cut short
+                    if end < len(buf) or eof:
+                        yield item
+                        pos = end
+                        continue
+                except ValueError:
+                    if eof:
+                        raise
+
+            if eof:
+                if not started:
+                    return
+                raise ValueError(f"{path} ends before the JSON array is closed")
+
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf = buf[pos:] + chunk
+            pos = 0
+
+def iter_jsonl(path, skip_invalid=False) -> Iterator[Any]:
+    """Yield one decoded value per non-empty line
+
+    With ``skip_invalid`` a line that is not valid JSON yields None instead
+    of raising, so the caller can count it and carry on.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                if not skip_invalid:
+                    raise
+                yield None
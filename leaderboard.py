@@ -0,0 +1,109 @@
+from __future__ import annotations
+import bisect
+import datetime
+import heapq
+import os
+import threading
+from typing import Iterable, List, Optional
+
+from jsonstream import iter_json_array, iter_jsonl
+from models import Result
+
+# ---------------- LEADERBOARD ----------------
+
+class _Entry:
+    """Heap entry ordered so the worst result sits at the top of a min-heap"""
+    __slots__ = ("key", "result")
+
+    def __init__(self, result: Result):
+        # Best results sort first: higher score, then earlier date
+        self.key = (-result.score, result.date)
+        self.result = result
+
+    def __lt__(self, other):
+        return self.key > other.key
+
+class Leaderboard:
+    """Top-K results kept in a bounded heap as they stream in
+
+    The heap admits or rejects each result against the current worst in
+    O(log K). A parallel best-first key list answers rank queries by
+    bisection, so nothing is ever fully re-sorted. Safe to share between
+    threads - the heap and key list only change together under a lock.
+    """
+
+    def __init__(self, capacity=20):
+        self.capacity = capacity
+        self._heap: List[_Entry] = []
+        self._keys: List[tuple] = []
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, result: Result) -> bool:
+        """Offer a result; returns True if it made the board"""
+        entry = _Entry(result)
+        with self._lock:
+            if len(self._heap) < self.capacity:
+                heapq.heappush(self._heap, entry)
+            elif entry.key < self._heap[0].key:
+                heapq.heapreplace(self._heap, entry)
+                # The evicted entry was the worst, which is always the last key
+                self._keys.pop()
+            else:
+                return False
+            bisect.insort(self._keys, entry.key)
+            return True
+
+    def extend(self, results: Iterable[Result]):
+        with self._lock:
+            for result in results:
+                self.push(result)
+
+    def would_rank(self, score, date=None) -> Optional[int]:
+        """1-based rank a new score would take, or None if it misses the board"""
+        if date is None:
+            date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # A new result ranks behind existing results with the same score and date
+        with self._lock:
+            rank = bisect.bisect_right(self._keys, (-score, date)) + 1
+        return rank if rank <= self.capacity else None
+
+    def rank(self, result: Result) -> Optional[int]:
+        """1-based rank of a result already on the board"""
+        key = (-result.score, result.date)
+        with self._lock:
+            i = bisect.bisect_left(self._keys, key)
+            if i < len(self._keys) and self._keys[i] == key:
+                return i + 1
+        return None
+
+    def top(self, n=None) -> List[Result]:
+        """Results best first - sorts at most K entries"""
+        with self._lock:
+            ranked = sorted(self._heap, key=lambda e: e.key)
+        return [e.result for e in ranked[:n]]
+
+    @classmethod
+    def from_results(cls, results: Iterable[Result], capacity=20):
+        board = cls(capacity)
+        board.extend(results)
+        return board
+
+    @classmethod
+    def from_file(cls, path, capacity=20):
+        """Build from a scores file in one pass, holding only K results
+
+        Accepts a JSON array (the old high_scores.json), JSON lines, or a
+        ScoreStore SQLite database.
+        """
+        ext = os.path.splitext(path)[1].lower()
+        if ext == ".db":
+            from score_store import ScoreStore
+            results = ScoreStore(path).iter_results()
+        elif ext == ".jsonl":
+            results = (Result(**r) for r in iter_jsonl(path))
+        else:
+            results = (Result(**r) for r in iter_json_array(path))
+        return cls.from_results(results, capacity)
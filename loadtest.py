@@ -0,0 +1,88 @@
+"""Load-test client for server.py
+
+Opens ``--rooms`` x ``--players`` TCP connections, plays every match to the
+end with random answers, and reports answer-to-result latency.
+
+    python server.py --answer-time 5 &
+    python loadtest.py --rooms 200 --players 4
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+async def play(host, port, room, name, players, think_time, stats):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    def send(message):
+        writer.write((json.dumps(message) + "\n").encode())
+
+    send({"type": "join", "room": room, "name": name})
+    await writer.drain()
+    answered_at = None
+    started = False
+
+    try:
+        async for raw in reader:
+            msg = json.loads(raw)
+            kind = msg["type"]
+            if kind == "joined" and not started and len(msg["players"]) >= players and msg["players"][0] == name:
+                # The first player to join kicks the match off once everyone is in
+                started = True
+                send({"type": "start"})
+            elif kind == "question":
+                await asyncio.sleep(random.uniform(0, think_time))
+                choice = None if random.random() < 0.1 else random.randrange(len(msg["choices"]))
+                send({"type": "answer", "index": msg["index"], "choice": choice})
+                answered_at = time.perf_counter()
+                stats["answers"] += 1
+            elif kind == "result" and answered_at is not None:
+                stats["latencies"].append(time.perf_counter() - answered_at)
+                answered_at = None
+            elif kind == "error":
+                stats["errors"] += 1
+            elif kind == "end":
+                stats["matches"] += 1
+                break
+            await writer.drain()
+    finally:
+        writer.close()
+
+async def run(args):
+    stats = {"answers": 0, "latencies": [], "errors": 0, "matches": 0}
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        play(args.host, args.port, f"room{r}", f"p{p}", args.players, args.think_time, stats)
+        for r in range(args.rooms)
+        for p in range(args.players)
+    ))
+    elapsed = time.perf_counter() - start
+
+    lat = stats["latencies"]
+    print(f"{args.rooms} rooms x {args.players} players: {elapsed:.2f} s, "
+          f"{stats['answers']:,} answers ({stats['answers'] / elapsed:,.0f}/s), errors {stats['errors']}")
+    print(f"answer-to-result latency: p50 {percentile(lat, 50) * 1000:.1f} ms, "
+          f"p99 {percentile(lat, 99) * 1000:.1f} ms, max {max(lat, default=0) * 1000:.1f} ms")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive server.py with many concurrent players")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rooms", type=int, default=100)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--think-time", type=float, default=0.5, help="max seconds before answering")
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
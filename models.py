@@ -0,0 +1,27 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import List, Optional
+
+# ---------------- DATA MODELS ----------------
+
+@dataclass
+class Question:
+    prompt: str
+    choices: List[str]
+    answer_index: int
+    category: Optional[str] = None
+    difficulty: Optional[str] = "Medium"
+
+@dataclass
+class Result:
+    player_name: str
+    score: int
+    max_score: int
+    date: str
+    total_time: Optional[float] = None
+    category_stats: Optional[dict] = None
+    # Seconds of feedback delay excluded from total_time
+    feedback_time: Optional[float] = None
+    # Per-question wait for a valid answer, and their sum
+    question_times: Optional[List[float]] = None
+    answer_time: Optional[float] = None
@@ -0,0 +1,86 @@
+from __future__ import annotations
+import os
+import sys
+import time
+
+# ---------------- PACING ----------------
+
+# Seconds to hold each kind of feedback on screen
+PACING_PROFILES = {
+    "normal": {"reveal": 1.5, "skip": 2.0, "progress": 1.0, "notice": 1.5},
+    "fast": {"reveal": 0.5, "skip": 0.75, "progress": 0.25, "notice": 0.5},
+    # No delays at all - for scripted and automated runs
+    "off": {"reveal": 0.0, "skip": 0.0, "progress": 0.0, "notice": 0.0},
+}
+
+def _wait_for_key_posix(timeout):
+    import select
+    import termios
+    import tty
+
+    fd = sys.stdin.fileno()
+    old = termios.tcgetattr(fd)
+    try:
+        # cbreak so a single keypress is visible to select without Enter
+        tty.setcbreak(fd)
+        ready, _, _ = select.select([fd], [], [], timeout)
+        if ready:
+            os.read(fd, 1024)
+            return True
+        return False
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old)
+
+def _wait_for_key_windows(timeout):
+    import msvcrt
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if msvcrt.kbhit():
+            while msvcrt.kbhit():
+                msvcrt.getwch()
+            return True
+        time.sleep(0.02)
+    return False
+
+def wait_for_key(timeout) -> bool:
+    """Wait up to ``timeout`` seconds; returns True if a key cut it short"""
+    try:
+        if not sys.stdin.isatty():
+            time.sleep(timeout)
+            return False
+        if os.name == "nt":
+            return _wait_for_key_windows(timeout)
+        return _wait_for_key_posix(timeout)
+    except (ImportError, OSError, ValueError):
+        time.sleep(timeout)
+        return False
+
+class Pacer:
+    """Feedback delays that any keypress skips, timed apart from the player
+
+    ``paused`` accumulates the seconds spent holding feedback on screen so
+    the game can take it out of the player's total_time.
+    """
+
+    def __init__(self, profile="normal", interruptible=True):
+        if profile not in PACING_PROFILES:
+            raise ValueError(f"Unknown pacing profile {profile!r}; choose from {', '.join(PACING_PROFILES)}")
+        self.profile = profile
+        self.delays = PACING_PROFILES[profile]
+        self.interruptible = interruptible
+        self.paused = 0.0
+
+    def pause(self, kind) -> float:
+        """Hold the screen for the profile's delay for ``kind``; returns seconds waited"""
+        delay = self.delays[kind]
+        if delay <= 0:
+            return 0.0
+        start = time.perf_counter()
+        if self.interruptible:
+            wait_for_key(delay)
+        else:
+            time.sleep(delay)
+        waited = time.perf_counter() - start
+        self.paused += waited
+        return waited
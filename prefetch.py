@@ -0,0 +1,87 @@
+from __future__ import annotations
+import threading
+from collections import deque
+from typing import Callable, List, Optional
+
+from models import Question
+
+# ---------------- PREFETCH ----------------
+
+class QuestionPrefetcher:
+    """Fills a bounded buffer of questions in the background
+
+    The buffer holds one game's worth of questions for the last-used
+    (category, difficulty), so "Play again" and follow-up multiplayer rounds
+    do not wait on the network. ``fetch`` is called as
+    ``fetch(amount, category, difficulty)`` from the worker thread, must not
+    write to the console, and should return only fresh questions - a short
+    batch is dropped rather than buffered.
+    """
+
+    def __init__(self, fetch: Callable[..., Optional[List[Question]]], capacity=50):
+        self._fetch = fetch
+        self.capacity = capacity
+        self._buffer: deque = deque(maxlen=capacity)
+        self._key = None
+        # Size of the last game served - the refill tops up to this
+        self._amount = 0
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def _take_buffered(self, key, amount):
+        with self._lock:
+            if self._key != key or len(self._buffer) < amount:
+                return None
+            return [self._buffer.popleft() for _ in range(amount)]
+
+    def take(self, amount, category=None, difficulty=None, fetch=None) -> Optional[List[Question]]:
+        """Serve ``amount`` questions from the buffer, falling back to ``fetch``
+
+        ``fetch`` may return a lazy stream; nothing is refilled here, so call
+        ``prefetch`` once the game has drained it - a refill running
+        alongside would race the game for the same batch.
+        """
+        key = (category, difficulty)
+        self._amount = min(amount, self.capacity)
+        questions = self._take_buffered(key, amount)
+
+        if questions is None and self._key == key and self._worker and self._worker.is_alive():
+            # A refill for these settings is already in flight - reuse it
+            self._worker.join()
+            questions = self._take_buffered(key, amount)
+
+        if questions is None:
+            questions = (fetch or self._fetch)(amount, category, difficulty)
+        return questions
+
+    def prefetch(self, category=None, difficulty=None):
+        """Start topping up the buffer for these settings in the background"""
+        key = (category, difficulty)
+        with self._lock:
+            if self._key != key:
+                self._key = key
+                self._buffer.clear()
+            if self._worker and self._worker.is_alive():
+                return
+            self._worker = threading.Thread(target=self._fill, args=(key,), daemon=True)
+            self._worker.start()
+
+    def _fill(self, key):
+        with self._lock:
+            missing = self._amount - len(self._buffer)
+        if missing <= 0:
+            return
+        try:
+            batch = self._fetch(missing, *key)
+        except Exception:
+            return
+        with self._lock:
+            # Settings changed while we were fetching - drop the stale batch.
+            # A short one is dropped too: the foreground fetch tops a game up
+            # with repeats, and a buffered game never would
+            if batch and len(batch) >= missing and self._key == key:
+                self._buffer.extend(batch)
+
+    def buffered(self):
+        with self._lock:
+            return len(self._buffer)
@@ -0,0 +1,169 @@
+from __future__ import annotations
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional
+
+from models import Result
+
+# ---------------- PLAYER PROFILES ----------------
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    player TEXT PRIMARY KEY,
+    games INTEGER NOT NULL,
+    best_score REAL NOT NULL,
+    total_score REAL NOT NULL,
+    total_max_score INTEGER NOT NULL,
+    total_time REAL NOT NULL,
+    first_played TEXT NOT NULL,
+    last_played TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profile_categories (
+    player TEXT NOT NULL,
+    category TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (player, category)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Every aggregate is folded in with one UPSERT - no history is ever re-read
+UPSERT_PROFILE = """
+INSERT INTO profiles (player, games, best_score, total_score, total_max_score, total_time,
+                      first_played, last_played)
+VALUES (?1, 1, ?2, ?2, ?3, ?4, ?5, ?5)
+ON CONFLICT (player) DO UPDATE SET
+    games = games + 1,
+    best_score = MAX(best_score, excluded.best_score),
+    total_score = total_score + excluded.total_score,
+    total_max_score = total_max_score + excluded.total_max_score,
+    total_time = total_time + excluded.total_time,
+    first_played = MIN(first_played, excluded.first_played),
+    last_played = MAX(last_played, excluded.last_played)
+"""
+
+UPSERT_CATEGORY = """
+INSERT INTO profile_categories (player, category, correct, total) VALUES (?, ?, ?, ?)
+ON CONFLICT (player, category) DO UPDATE SET
+    correct = correct + excluded.correct,
+    total = total + excluded.total
+"""
+
+@dataclass
+class Profile:
+    player_name: str
+    games: int
+    best_score: float
+    total_score: float
+    total_max_score: int
+    total_time: float
+    first_played: str
+    last_played: str
+    category_stats: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    @property
+    def average_score(self):
+        return self.total_score / self.games if self.games else 0
+
+    @property
+    def accuracy(self):
+        """Share of all questions answered correctly, across categories"""
+        total = sum(s["total"] for s in self.category_stats.values())
+        return sum(s["correct"] for s in self.category_stats.values()) / total if total else 0
+
+class ProfileStore:
+    """Running per-player aggregates, updated in O(1) per finished game
+
+    Reading a profile is two primary-key lookups, whatever the number of
+    players or games. Profiles share the score database; the first open
+    folds in any history already there.
+    """
+
+    def __init__(self, path, score_store=None, busy_timeout=30.0):
+        self.path = path
+        self.score_store = score_store
+        self.busy_timeout = busy_timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            if self.score_store is not None:
+                # Open the score store first - its own one-off migration
+                # must not wait behind the backfill's write lock
+                self.score_store.conn
+                self.backfill(self.score_store.iter_results())
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _fold(conn, results: Iterable[Result]):
+        for r in results:
+            conn.execute(UPSERT_PROFILE, (r.player_name, r.score, r.max_score, r.total_time or 0, r.date))
+            conn.executemany(UPSERT_CATEGORY, (
+                (r.player_name, category, stats["correct"], stats["total"])
+                for category, stats in (r.category_stats or {}).items()
+            ))
+
+    def record(self, *results: Result):
+        """Fold finished games into their players' profiles atomically"""
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._fold(conn, results)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def backfill(self, results: Iterable[Result]):
+        """One-off import of games recorded before profiles existed"""
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Checked under the write lock so two processes cannot both import
+            if conn.execute("SELECT value FROM meta WHERE key = 'profiles_backfilled'").fetchone():
+                conn.execute("ROLLBACK")
+                return
+            self._fold(conn, results)
+            conn.execute("INSERT INTO meta (key, value) VALUES ('profiles_backfilled', '1')")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, player) -> Optional[Profile]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT player, games, best_score, total_score, total_max_score, total_time, "
+                "first_played, last_played FROM profiles WHERE player = ?", (player,)
+            ).fetchone()
+            if row is None:
+                return None
+            categories = self.conn.execute(
+                "SELECT category, correct, total FROM profile_categories WHERE player = ? ORDER BY category",
+                (player,)
+            ).fetchall()
+        profile = Profile(*row)
+        profile.category_stats = {c: {"correct": correct, "total": total} for c, correct, total in categories}
+        return profile
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
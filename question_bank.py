@@ -0,0 +1,132 @@
+from __future__ import annotations
+import random
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from compact import CompactBank
+from models import Question
+
+# Category mapping: API ID -> Category name in fallback
+CATEGORY_MAP = {
+    9: "General Knowledge",
+    18: "Science: Computers",
+    21: "Sports",
+    22: "Geography",
+    23: "History",
+    17: "Science & Nature",
+    10: "Entertainment: Books",
+    11: "Entertainment: Film",
+    12: "Entertainment: Music",
+    15: "Entertainment: Video Games",
+    20: "Mythology",
+    27: "Animals",
+    24: "Politics",
+    29: "Entertainment: Comics"
+}
+
+# ---------------- QUESTION BANK ----------------
+
+class QuestionBank:
+    """Offline question bank indexed by category and difficulty
+
+    The indexes are built once, so ``sample`` only touches the questions it
+    returns instead of scanning the whole bank on every game start.
+    """
+
+    def __init__(self, questions: Union[CompactBank, Sequence[Question]]):
+        # Rows live in columnar storage; indexes are arrays of row ids
+        if isinstance(questions, CompactBank):
+            self._rows = questions
+        else:
+            self._rows = CompactBank.from_questions(questions)
+        self._by_category: Dict[str, array] = {}
+        self._by_difficulty: Dict[str, array] = {}
+        self._by_key: Dict[Tuple[str, str], array] = {}
+
+        rows = self._rows
+        for i in range(len(rows)):
+            category, difficulty = rows.category(i), rows.difficulty(i)
+            self._by_category.setdefault(category, array("I")).append(i)
+            self._by_difficulty.setdefault(difficulty, array("I")).append(i)
+            self._by_key.setdefault((category, difficulty), array("I")).append(i)
+
+    @classmethod
+    def from_dicts(cls, items):
+        """Build a bank from FALLBACK_QUESTIONS-style dicts"""
+        return cls(CompactBank.from_dicts(items))
+
+    def __len__(self):
+        return len(self._rows)
+
+    # Index lookups - overridden by banks that keep their records elsewhere
+
+    def _all_ids(self) -> Sequence[int]:
+        return range(len(self._rows))
+
+    def _category_ids(self, category: str) -> Sequence[int]:
+        return self._by_category.get(category, ())
+
+    def _difficulty_ids(self, difficulty: str) -> Sequence[int]:
+        return self._by_difficulty.get(difficulty, ())
+
+    def _key_ids(self, category: str, difficulty: str) -> Sequence[int]:
+        return self._by_key.get((category, difficulty), ())
+
+    def _get(self, i: int) -> Question:
+        return self._rows.question(i)
+
+    def pick(self, category: Optional[str] = None, difficulty: Optional[str] = None,
+             rng=random) -> Optional[Question]:
+        """One random question from an exact (category name, difficulty) pool
+
+        Either may be None for "any". Only the index lengths are read, so
+        this stays constant-time however large the bank is.
+        """
+        if category and difficulty:
+            pool = self._key_ids(category, difficulty)
+        elif category:
+            pool = self._category_ids(category)
+        elif difficulty:
+            pool = self._difficulty_ids(difficulty)
+        else:
+            pool = self._all_ids()
+        if not len(pool):
+            return None
+        return self._get(pool[rng.randrange(len(pool))])
+
+    def sample(self, amount=10, category=None, difficulty=None) -> Optional[List[Question]]:
+        """Pick ``amount`` questions, relaxing difficulty before leaving the category"""
+        if category and category in CATEGORY_MAP:
+            cat_name = CATEGORY_MAP[category]
+            # ALWAYS stay in the requested category
+            pool = self._category_ids(cat_name)
+
+            # Only narrow by difficulty if there are enough questions for it,
+            # otherwise use the whole category (mixed difficulties)
+            if difficulty and pool:
+                difficulty_pool = self._key_ids(cat_name, difficulty.capitalize())
+                if len(difficulty_pool) >= amount:
+                    pool = difficulty_pool
+
+        # No category specified - filter by difficulty only if specified
+        elif difficulty:
+            pool = self._all_ids()
+            difficulty_pool = self._difficulty_ids(difficulty.capitalize())
+            if len(difficulty_pool) >= amount:
+                pool = difficulty_pool
+        else:
+            pool = self._all_ids()
+
+        if len(pool) == 0:
+            return None
+
+        if len(pool) < amount:
+            # Not enough unique questions - repeat the pool to reach the amount
+            repeats = -(-amount // len(pool))
+            selected = (list(pool) * repeats)[:amount]
+            random.shuffle(selected)
+        else:
+            # Random selection without replacement
+            selected = random.sample(pool, amount)
+
+        return [self._get(i) for i in selected]
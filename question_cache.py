@@ -0,0 +1,123 @@
+from __future__ import annotations
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import List, Optional
+
+from models import Question
+
+# ---------------- QUESTION CACHE ----------------
+
+class QuestionCache:
+    """On-disk cache of parsed API questions keyed by (category, difficulty)
+
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted once more than ``max_entries`` keys are stored. Each entry keeps up
+    to ``max_questions`` questions so a warm start can serve a whole game.
+    """
+
+    def __init__(self, path, ttl=6 * 3600, max_entries=64, max_questions=200):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_questions = max_questions
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries: Optional[OrderedDict] = None
+        # The prefetch worker reads and writes the cache from its own thread
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(category, difficulty):
+        return f"{category or ''}:{(difficulty or '').lower()}"
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._entries = OrderedDict(data.get("entries", []))
+        except (OSError, ValueError, AttributeError):
+            self._entries = OrderedDict()
+        return self._entries
+
+    def _save(self):
+        # Write to a temp file first so a crash never leaves a truncated cache
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"entries": list(self._entries.items())}, f)
+        os.replace(tmp_path, self.path)
+
+    def _fresh(self, entry):
+        return time.time() - entry["stored_at"] < self.ttl
+
+    def get(self, category=None, difficulty=None, amount=10, exclude=()) -> Optional[List[Question]]:
+        """Return ``amount`` cached questions whose prompt is not in ``exclude``"""
+        with self._lock:
+            entries = self._load()
+            key = self._key(category, difficulty)
+            entry = entries.get(key)
+
+            if entry is not None and not self._fresh(entry):
+                del entries[key]
+                self.expirations += 1
+                self._save()
+                entry = None
+
+            candidates = entry["questions"] if entry is not None else []
+            if exclude:
+                candidates = [q for q in candidates if q["prompt"] not in exclude]
+
+            if len(candidates) < amount:
+                self.misses += 1
+                return None
+
+            entries.move_to_end(key)
+            self.hits += 1
+            return [Question(**q) for q in random.sample(candidates, amount)]
+
+    def put(self, category, difficulty, questions: List[Question]):
+        """Merge freshly fetched questions into the entry for this key"""
+        with self._lock:
+            entries = self._load()
+            key = self._key(category, difficulty)
+            entry = entries.pop(key, None)
+            if entry is None or not self._fresh(entry):
+                entry = {"stored_at": time.time(), "questions": []}
+
+            known = {q["prompt"] for q in entry["questions"]}
+            for q in questions:
+                if q.prompt not in known:
+                    known.add(q.prompt)
+                    entry["questions"].append(asdict(q))
+            # Keep the newest questions when an entry grows past its cap
+            entry["questions"] = entry["questions"][-self.max_questions:]
+
+            entries[key] = entry
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+                self.evictions += 1
+            self._save()
+
+    def clear(self):
+        self._entries = OrderedDict()
+        self._save()
+
+    def stats(self):
+        """Hit/miss counters used to tune ttl and max_entries"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._load()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
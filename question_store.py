@@ -0,0 +1,359 @@
+"""SQLite question store for large imported trivia dumps
+
+Questions live in one table keyed by (group, seq), where a group is a
+(category, difficulty) pair and ``seq`` numbers its questions 0..n-1. The
+group table is tiny and kept in memory, so every pool ``sample`` needs is a
+set of group ranges, and drawing N questions is N primary-key lookups.
+
+Duplicates are dropped by a unique index on the normalized fingerprint
+(see dedup.py) of the prompt and choices; an insert trigger hands out ``seq`` numbers, so an
+ignored duplicate never leaves a gap.
+
+Import dumps (JSON arrays, JSONL or CSV; OpenTDB exports or
+FALLBACK_QUESTIONS-style dicts) with:
+
+    python question_store.py import questions.db [dump.jsonl ...]
+"""
+from __future__ import annotations
+import csv
+import html
+import json
+import sqlite3
+import sys
+import threading
+from bisect import bisect_right
+from collections.abc import Sequence
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from dedup import DuplicateIndex, fingerprint
+from models import Question
+from question_bank import QuestionBank
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS groups (
+    id INTEGER PRIMARY KEY,
+    category TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (category, difficulty)
+);
+CREATE TABLE IF NOT EXISTS questions (
+    grp INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    key INTEGER NOT NULL UNIQUE,
+    prompt TEXT NOT NULL,
+    choices TEXT NOT NULL,
+    answer_index INTEGER NOT NULL,
+    PRIMARY KEY (grp, seq)
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS questions_seq AFTER INSERT ON questions
+BEGIN
+    UPDATE groups SET n = n + 1 WHERE id = NEW.grp;
+END;
+"""
+
+INSERT = (
+    "INSERT OR IGNORE INTO questions (grp, seq, key, prompt, choices, answer_index) "
+    "VALUES (?1, (SELECT n FROM groups WHERE id = ?1), ?2, ?3, ?4, ?5)"
+)
+
+# Choices are stored joined on a separator that never appears in trivia text
+SEP = "\x1f"
+
+# ---------------- PARSING ----------------
+
+def validate(q: Question) -> bool:
+    """The game's invariants: a prompt, four distinct choices, a valid answer"""
+    choices = q.choices
+    return (
+        len(choices) == 4
+        and type(q.answer_index) is int
+        and 0 <= q.answer_index < 4
+        and isinstance(q.prompt, str) and bool(q.prompt.strip())
+        and all(isinstance(c, str) for c in choices)
+        and len({c.strip() for c in choices} - {""}) == 4
+        and SEP not in "".join(choices)
+    )
+
+def _csv_item(row: Dict[str, str]) -> dict:
+    """CSV row -> OpenTDB item or FALLBACK_QUESTIONS-style dict
+
+    OpenTDB columns: question, correct_answer, incorrect_answer_1..3,
+    category, difficulty. Plain columns: prompt, choice_1..4,
+    answer_index, category, difficulty.
+    """
+    numbered = lambda prefix: [row[k] for k in sorted(row) if k and k.startswith(prefix) and row[k]]
+    if "correct_answer" in row:
+        item = dict(row)
+        item["incorrect_answers"] = numbered("incorrect_answer")
+        item.setdefault("category", "General Knowledge")
+        item["difficulty"] = item.get("difficulty") or "medium"
+        return item
+    return {
+        "prompt": row.get("prompt"),
+        "choices": numbered("choice"),
+        "answer_index": row.get("answer_index"),
+        "category": row.get("category") or "General Knowledge",
+        "difficulty": (row.get("difficulty") or "Medium").capitalize()
+    }
+
+def iter_items(path) -> Iterator[Optional[dict]]:
+    """Raw items from a JSON array, JSONL or CSV file, one at a time
+
+    A JSONL line that does not decode comes through as None.
+    """
+    from jsonstream import iter_json_array, iter_jsonl
+
+    if path.endswith(".jsonl"):
+        yield from iter_jsonl(path, skip_invalid=True)
+    elif path.endswith(".csv"):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            yield from (_csv_item(row) for row in csv.DictReader(f))
+    else:
+        try:
+            yield from iter_json_array(path)
+        except ValueError:
+            # An OpenTDB API response ({"results": [...]}) - small by design
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            yield from data.get("results", []) if isinstance(data, dict) else ()
+
+def item_question(item) -> Optional[Question]:
+    """Question from one dump item, HTML-unescaped like API results
+
+    Returns None for anything malformed, so one bad row never aborts an import.
+    """
+    try:
+        return _item_question(item)
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+
+def _item_question(item) -> Optional[Question]:
+    if "correct_answer" in item:
+        incorrect = [html.unescape(a) for a in item["incorrect_answers"]]
+        return Question(
+            prompt=html.unescape(item["question"]),
+            choices=incorrect + [html.unescape(item["correct_answer"])],
+            answer_index=len(incorrect),
+            category=html.unescape(item.get("category") or "General Knowledge"),
+            difficulty=(item.get("difficulty") or "medium").capitalize()
+        )
+    if "prompt" in item:
+        return Question(
+            prompt=item["prompt"],
+            choices=list(item["choices"]),
+            answer_index=int(item["answer_index"]),
+            category=item.get("category") or "General Knowledge",
+            difficulty=(item.get("difficulty") or "Medium").capitalize()
+        )
+    return None
+
+# ---------------- STORE ----------------
+
+class _GroupIds(Sequence):
+    """Virtual id list spanning several groups - ``(grp << 32) | seq``"""
+
+    def __init__(self, groups: List[Tuple[int, int]]):
+        self._groups = [(grp, n) for grp, n in groups if n]
+        self._starts = []
+        total = 0
+        for _, n in self._groups:
+            self._starts.append(total)
+            total += n
+        self._len = total
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._len))]
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError(i)
+        g = bisect_right(self._starts, i) - 1
+        return (self._groups[g][0] << 32) | (i - self._starts[g])
+
+class QuestionStore(QuestionBank):
+    """QuestionBank backed by an indexed SQLite file of imported questions"""
+
+    def __init__(self, path, busy_timeout=30.0):
+        self.path = path
+        self._lock = threading.Lock()
+        # Games draw from the prefetch thread as well as the main one
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, isolation_level=None,
+                                     check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._load_groups()
+
+    def _load_groups(self):
+        self._groups: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        for grp, category, difficulty, n in self._conn.execute(
+                "SELECT id, category, difficulty, n FROM groups ORDER BY id"):
+            self._groups[(category, difficulty)] = (grp, n)
+
+    def __len__(self):
+        return sum(n for _, n in self._groups.values())
+
+    def close(self):
+        self._conn.close()
+
+    def _ids(self, match) -> _GroupIds:
+        return _GroupIds([ids for key, ids in self._groups.items() if match(*key)])
+
+    def _all_ids(self):
+        return self._ids(lambda c, d: True)
+
+    def _category_ids(self, category):
+        return self._ids(lambda c, d: c == category)
+
+    def _difficulty_ids(self, difficulty):
+        return self._ids(lambda c, d: d == difficulty)
+
+    def _key_ids(self, category, difficulty):
+        return self._ids(lambda c, d: (c, d) == (category, difficulty))
+
+    def _get(self, i) -> Question:
+        grp, seq = i >> 32, i & 0xFFFFFFFF
+        with self._lock:
+            prompt, choices, answer_index, category, difficulty = self._conn.execute(
+                "SELECT prompt, choices, answer_index, category, difficulty "
+                "FROM questions JOIN groups ON groups.id = grp WHERE grp = ? AND seq = ?",
+                (grp, seq)
+            ).fetchone()
+        return Question(
+            prompt=prompt,
+            choices=choices.split(SEP),
+            answer_index=answer_index,
+            category=category,
+            difficulty=difficulty
+        )
+
+    def iter_questions(self, batch_size=10000) -> Iterator[Question]:
+        """Stream every stored question, a page of rows at a time"""
+        last = (-1, -1)
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT grp, seq, prompt, choices, answer_index, category, difficulty "
+                    "FROM questions JOIN groups ON groups.id = grp "
+                    "WHERE (grp, seq) > (?, ?) ORDER BY grp, seq LIMIT ?",
+                    last + (batch_size,)
+                ).fetchall()
+            if not rows:
+                return
+            last = rows[-1][:2]
+            for _, _, prompt, choices, answer_index, category, difficulty in rows:
+                yield Question(prompt, choices.split(SEP), answer_index, category, difficulty)
+
+    # Import
+
+    def _group(self, category, difficulty) -> int:
+        key = (category, difficulty)
+        if key not in self._groups:
+            grp = self._conn.execute(
+                "INSERT INTO groups (category, difficulty) VALUES (?, ?)", key
+            ).lastrowid
+            self._groups[key] = (grp, 0)
+        return self._groups[key][0]
+
+    def import_questions(self, questions: Iterable[Optional[Question]], batch_size=10000,
+                         index: Optional[DuplicateIndex] = None) -> Dict[str, int]:
+        """Validate, dedup and insert a stream of questions in one transaction
+
+        Only ``batch_size`` rows are held in memory at a time; exact duplicates
+        are caught by the unique key index, including ones already in the
+        store. Pass a DuplicateIndex (see ``near_duplicate_index``) to drop
+        reworded near duplicates as well, at the cost of keeping the index
+        in memory.
+        """
+        stats = {"read": 0, "invalid": 0, "imported": 0}
+        conn = self._conn
+        before = len(self)
+        with self._lock:
+            # A bulk load is all-or-nothing, so the journal buys nothing per row
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                questions = iter(questions)
+                while True:
+                    batch = list(islice(questions, batch_size))
+                    if not batch:
+                        break
+                    stats["read"] += len(batch)
+                    rows = []
+                    for q in batch:
+                        if q is None or not validate(q):
+                            stats["invalid"] += 1
+                            continue
+                        if index is not None and not index.add(q):
+                            continue
+                        rows.append((
+                            self._group(q.category, q.difficulty),
+                            fingerprint(q.prompt, q.choices),
+                            q.prompt,
+                            SEP.join(q.choices),
+                            q.answer_index
+                        ))
+                    conn.executemany(INSERT, rows)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                conn.execute("PRAGMA synchronous=FULL")
+                self._load_groups()
+        stats["imported"] = len(self) - before
+        stats["duplicates"] = stats["read"] - stats["invalid"] - stats["imported"]
+        return stats
+
+    def import_file(self, path, batch_size=10000, index: Optional[DuplicateIndex] = None) -> Dict[str, int]:
+        """Stream one JSON / JSONL / CSV dump into the store"""
+        return self.import_questions((item_question(item) for item in iter_items(path)), batch_size, index)
+
+    def near_duplicate_index(self) -> DuplicateIndex:
+        """DuplicateIndex seeded with everything already in the store"""
+        index = DuplicateIndex()
+        index.update(self.iter_questions())
+        return index
+
+# ---------------- CLI ----------------
+
+def main(argv=None):
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Bulk import trivia dumps into the offline question store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    import_cmd = sub.add_parser("import", help="import fallback_questions.py plus any dumps")
+    import_cmd.add_argument("output", help="store file, created if missing (e.g. questions.db)")
+    import_cmd.add_argument("sources", nargs="*", help="JSON, JSONL or CSV dumps")
+    import_cmd.add_argument("--no-fallback", action="store_true",
+                            help="leave out the built-in fallback_questions.py bank")
+    import_cmd.add_argument("--batch-size", type=int, default=10000)
+    import_cmd.add_argument("--near-duplicates", action="store_true",
+                            help="also drop reworded near duplicates (slower, index held in memory)")
+    args = parser.parse_args(argv)
+
+    store = QuestionStore(args.output)
+    try:
+        index = store.near_duplicate_index() if args.near_duplicates else None
+        if not args.no_fallback:
+            from fallback_questions import FALLBACK_QUESTIONS
+            stats = store.import_questions((item_question(item) for item in FALLBACK_QUESTIONS),
+                                           args.batch_size, index)
+            print(f"fallback_questions.py: {stats['imported']} imported")
+        for source in args.sources:
+            start = time.perf_counter()
+            stats = store.import_file(source, args.batch_size, index)
+            print(f"{source}: {stats['imported']} imported, {stats['duplicates']} duplicates, "
+                  f"{stats['invalid']} invalid ({time.perf_counter() - start:.1f}s)")
+        print(f"{args.output} now holds {len(store)} questions")
+    finally:
+        store.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
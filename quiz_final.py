@@ -1,270 +1,291 @@
 from __future__ import annotations
-import json
+import os
 import random
+import threading
 import datetime
 import time
-import requests
-import html
-from dataclasses import dataclass, asdict
-from typing import List, Optional
-from rich.console import Console
+from functools import partial
+from rich.console import Console, Group
 from rich.panel import Panel
-from rich.table import Table
 from rich import box
 
+from models import Question, Result
+from question_bank import QuestionBank
+from question_cache import QuestionCache
+from prefetch import QuestionPrefetcher
+from score_store import ScoreStore
+from leaderboard import Leaderboard
+from engine import ScoreKeeper
+from render import make_renderer, question_frame
+from pacing import PACING_PROFILES, Pacer
+from dedup import DuplicateIndex
+from adaptive import AdaptiveSelector, RatingStore
+from profiles import ProfileStore
+from review import ReviewQueue, ReviewRecorder
+from eventlog import EventWriter
+from instrument import Profiler
+from sources import (QuestionStream, api_source, bank_source, cache_source, dedup, fallback,
+                     file_source, pad, pooled_source, take)
+from trivia_client import TRIVIA_API_URL, TriviaClient, TriviaFetcher
+
 console = Console()
 
 HIGH_SCORES_FILE = "high_scores.json"
+HIGH_SCORES_DB = "high_scores.db"
 MAX_HIGH_SCORES = 20
-TRIVIA_API_URL = "https://opentdb.com/api.php"
-
-# Import fallback questions
-try:
-    from fallback_questions import FALLBACK_QUESTIONS
-except ImportError:
-    FALLBACK_QUESTIONS = []
-
-# ---------------- DATA MODELS ----------------
-
-@dataclass
-class Question:
-    prompt: str
-    choices: List[str]
-    answer_index: int
-    category: Optional[str] = None
-    difficulty: Optional[str] = "Medium"
-
-@dataclass
-class Result:
-    player_name: str
-    score: int
-    max_score: int
-    date: str
-    total_time: Optional[float] = None
-    category_stats: Optional[dict] = None
+# Rows shown on the High Scores screen
+HIGH_SCORES_SHOWN = 10
+QUESTION_BANK_FILE = "questions.qbank"
+QUESTION_STORE_FILE = "questions.db"
+# "normal", "fast" or "off" (no feedback delays, for automated runs)
+PACING = os.environ.get("QUIZ_PACING", "normal")
+if PACING not in PACING_PROFILES:
+    # Caught here, not when the first answer's feedback pauses mid-game
+    console.print(f"[yellow]Unknown QUIZ_PACING {PACING!r} - using \"normal\" "
+                  f"(choose from {', '.join(PACING_PROFILES)})[/yellow]")
+    PACING = "normal"
+RENDER_MODE = "diff"  # "diff" rewrites only changed lines, "full" clears per question
+# Extra JSON / JSONL question files tried after the API, before the built-in bank
+LOCAL_QUESTION_FILES = [
+    path for path in os.environ.get("QUIZ_QUESTION_FILES", "").split(os.pathsep) if path
+]
+# Set to a .json or .prom path to export the session's timing profile on exit
+PROFILE_EXPORT = os.environ.get("QUIZ_PROFILE")
+QUESTION_CACHE_FILE = "question_cache.json"
+QUESTION_CACHE_TTL = 6 * 3600
+QUESTION_CACHE_MAX_ENTRIES = 64
+
+TRIVIA_CLIENT = TriviaClient(TRIVIA_API_URL)
+
+QUESTION_CACHE = QuestionCache(
+    QUESTION_CACHE_FILE,
+    ttl=QUESTION_CACHE_TTL,
+    max_entries=QUESTION_CACHE_MAX_ENTRIES
+)
+
+# Older high_scores.json leaderboards are imported on first use
+SCORE_STORE = ScoreStore(HIGH_SCORES_DB, legacy_json=HIGH_SCORES_FILE)
+
+# Adaptive-difficulty ratings and player profiles live alongside the scores
+RATING_STORE = RatingStore(HIGH_SCORES_DB)
+PROFILE_STORE = ProfileStore(HIGH_SCORES_DB, score_store=SCORE_STORE)
+# Missed and skipped questions come back in Review Mode on an SM-2 schedule
+REVIEW_QUEUE = ReviewQueue(HIGH_SCORES_DB)
+
+# Every answer, as fixed-width binary records (python eventlog.py answers.qlog)
+EVENT_LOG_FILE = "answers.qlog"
+EVENT_WRITER = EventWriter(EVENT_LOG_FILE)
+
+# Every full batch pulled under the session token also warms the on-disk cache
+TRIVIA_FETCHER = TriviaFetcher(TRIVIA_CLIENT, on_batch=QUESTION_CACHE.put)
 
 # ---------------- STORAGE ----------------
 
+_fallback_bank = None
+
+def get_fallback_bank():
+    """Build the indexed offline bank the first time a game needs it"""
+    global _fallback_bank
+    if _fallback_bank is None and os.path.exists(QUESTION_STORE_FILE):
+        # Bulk-imported dumps (python question_store.py import) - queried by index
+        from question_store import QuestionStore
+        _fallback_bank = QuestionStore(QUESTION_STORE_FILE)
+    if _fallback_bank is None and os.path.exists(QUESTION_BANK_FILE):
+        # Precompiled bank (python binary_bank.py compile) - nothing to build
+        from binary_bank import BinaryBank
+        _fallback_bank = BinaryBank(QUESTION_BANK_FILE)
+    if _fallback_bank is None:
+        # Import fallback questions - deferred so the menu does not wait on them
+        try:
+            from fallback_questions import FALLBACK_QUESTIONS
+        except ImportError:
+            FALLBACK_QUESTIONS = []
+        _fallback_bank = QuestionBank.from_dicts(FALLBACK_QUESTIONS)
+    return _fallback_bank
+
+def __getattr__(name):
+    # Keep quiz_final.FALLBACK_QUESTIONS / FALLBACK_BANK working, loaded on access
+    if name == "FALLBACK_QUESTIONS":
+        try:
+            from fallback_questions import FALLBACK_QUESTIONS
+        except ImportError:
+            FALLBACK_QUESTIONS = []
+        return FALLBACK_QUESTIONS
+    if name == "FALLBACK_BANK":
+        return get_fallback_bank()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def load_fallback_questions(amount=10, category=None, difficulty=None):
     """Load questions from fallback bank when API is unavailable"""
-    if not FALLBACK_QUESTIONS:
-        return None
-    
-    # Category mapping: API ID -> Category name in fallback
-    category_map = {
-        9: "General Knowledge",
-        18: "Science: Computers",
-        21: "Sports",
-        22: "Geography",
-        23: "History",
-        17: "Science & Nature",
-        10: "Entertainment: Books",
-        11: "Entertainment: Film",
-        12: "Entertainment: Music",
-        15: "Entertainment: Video Games",
-        20: "Mythology",
-        27: "Animals",
-        24: "Politics",
-        29: "Entertainment: Comics"
-    }
-    
-    # Start with all questions
-    available_questions = list(FALLBACK_QUESTIONS)
-    
-    # Filter by category if specified
-    if category and category in category_map:
-        cat_name = category_map[category]
-        # ALWAYS filter by category first - we must stay in the requested category
-        available_questions = [q for q in available_questions if q.get("category") == cat_name]
-        
-        # If category has questions, try to filter by difficulty too
-        if difficulty and available_questions:
-            difficulty_cap = difficulty.capitalize()
-            difficulty_filtered = [q for q in available_questions if q.get("difficulty") == difficulty_cap]
-            
-            # If we have enough with the specific difficulty, use those
-            if len(difficulty_filtered) >= amount:
-                available_questions = difficulty_filtered
-            # Otherwise, use all questions from the category (mixed difficulties)
-            # This way we stay in the category but relax difficulty requirement
-    
-    # No category specified - filter by difficulty only if specified
-    elif difficulty:
-        difficulty_cap = difficulty.capitalize()
-        difficulty_filtered = [q for q in available_questions if q.get("difficulty") == difficulty_cap]
-        if len(difficulty_filtered) >= amount:
-            available_questions = difficulty_filtered
-    
-    # Ensure we have questions
-    if len(available_questions) == 0:
+    bank = get_fallback_bank()
+    if not len(bank):
         return None
-    
-    # If we don't have enough unique questions, repeat some to reach the amount
-    if len(available_questions) < amount:
-        # Use all available questions multiple times if needed
-        selected = []
-        while len(selected) < amount:
-            # Add all available questions
-            selected.extend(available_questions)
-        # Trim to exact amount needed
-        selected = selected[:amount]
-        # Shuffle to randomize the order
-        random.shuffle(selected)
-    else:
-        # Random selection without replacement
-        selected = random.sample(available_questions, amount)
-    
-    # Convert to Question objects
-    questions = []
-    for item in selected:
-        questions.append(Question(
-            prompt=item["prompt"],
-            choices=item["choices"],
-            answer_index=item["answer_index"],
-            category=item.get("category", "General Knowledge"),
-            difficulty=item.get("difficulty", "Medium")
-        ))
-    
-    return questions
 
-def fetch_questions_from_api(amount=10, category=None, difficulty=None):
+    return bank.sample(amount, category, difficulty)
+
+# Exact and near-duplicate index of every question handed to a game this session
+SEEN_QUESTIONS = DuplicateIndex()
+
+def question_stream(amount=10, category=None, difficulty=None, quiet=False, repeat=True):
+    """Lazily pull questions: API pool -> cache -> API -> local files -> offline bank
+
+    With ``repeat`` off the stream may come up short instead of being topped
+    up with questions already shown this session.
+    """
+    # Background prefetches must not draw over the question being answered
+    say = (lambda *args: None) if quiet else console.print
+
+    sources = [
+        # Surplus from an earlier 50-question batch costs no request at all
+        pooled_source(TRIVIA_FETCHER, amount, category, difficulty),
+        # Warm start - serve the game straight from the local cache
+        cache_source(QUESTION_CACHE, TRIVIA_FETCHER, amount, category, difficulty),
+        api_source(TRIVIA_FETCHER, amount, category, difficulty,
+                   on_request=lambda: say("[yellow]Loading questions...[/yellow]")),
+    ]
+    sources.extend(file_source(path, category, difficulty) for path in LOCAL_QUESTION_FILES)
+    sources.append(bank_source(get_fallback_bank, amount, category, difficulty))
+
+    # Nothing shown earlier this session comes back unless every source is exhausted
+    stream = dedup(fallback(*sources), SEEN_QUESTIONS)
+    if repeat:
+        repeats = bank_source(get_fallback_bank, amount, category, difficulty, rounds=1)
+        stream = pad(stream, amount, repeats)
+    return QuestionStream(take(stream, amount), amount)
+
+def fetch_questions_from_api(amount=10, category=None, difficulty=None, quiet=False, repeat=True):
     """Fetch questions from Open Trivia Database API with seamless fallback"""
-    try:
-        params = {
-            'amount': amount,
-            'type': 'multiple'
-        }
-        
-        if category:
-            params['category'] = category
-        
-        if difficulty:
-            params['difficulty'] = difficulty
-        
-        console.print("[yellow]Loading questions...[/yellow]")
-        response = requests.get(TRIVIA_API_URL, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
-        
-        if data['response_code'] != 0:
-            # API error - silently fallback
-            return load_fallback_questions(amount, category, difficulty)
-        
-        questions = []
-        for item in data['results']:
-            prompt = html.unescape(item['question'])
-            correct = html.unescape(item['correct_answer'])
-            incorrect = [html.unescape(ans) for ans in item['incorrect_answers']]
-            
-            all_choices = incorrect + [correct]
-            answer_index = len(incorrect)
-            
-            questions.append(Question(
-                prompt=prompt,
-                choices=all_choices,
-                answer_index=answer_index,
-                category=html.unescape(item['category']),
-                difficulty=item['difficulty'].capitalize()
-            ))
-        
-        console.print(f"[green]Successfully loaded {len(questions)} questions![/green]")
-        time.sleep(1)
-        return questions
-        
-    except (requests.RequestException, Exception):
-        # Network error or any other error - silently fallback
-        fallback = load_fallback_questions(amount, category, difficulty)
-        if fallback:
-            console.print(f"[green]Successfully loaded {len(fallback)} questions![/green]")
-            time.sleep(1)
-            return fallback
+    questions = list(question_stream(amount, category, difficulty, quiet, repeat))
+    if not questions:
         return None
+    if not quiet:
+        console.print(f"[green]Successfully loaded {len(questions)} questions![/green]")
+    return questions
+
+# Phase timings (fetch, render, input, scoring) across the whole session
+PROFILER = Profiler()
+
+# Keeps the next game's questions loading while the current one is played.
+# Only fresh questions are buffered - padding is left to the foreground fetch
+PREFETCHER = QuestionPrefetcher(partial(fetch_questions_from_api, quiet=True, repeat=False))
+
+_leaderboard = None
+# Server rooms finish on executor threads - seeding and saving go one at a time
+_results_lock = threading.RLock()
+
+def get_leaderboard():
+    """Top MAX_HIGH_SCORES kept in a bounded heap, seeded once from the store"""
+    global _leaderboard
+    with _results_lock:
+        if _leaderboard is None:
+            _leaderboard = Leaderboard.from_results(load_high_scores(), MAX_HIGH_SCORES)
+        return _leaderboard
 
 def load_high_scores():
-    try:
-        with open(HIGH_SCORES_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return [Result(**r) for r in data]
-    except:
-        return []
-
-def save_high_scores(results):
-    results_sorted = sorted(results, key=lambda r: (-r.score, r.date))[:MAX_HIGH_SCORES]
-    with open(HIGH_SCORES_FILE, "w", encoding="utf-8") as f:
-        json.dump([asdict(r) for r in results_sorted], f, indent=2)
+    return SCORE_STORE.top(MAX_HIGH_SCORES)
+
+def save_result(*results):
+    """Record finished games - one indexed insert each, no full rewrite"""
+    with _results_lock:
+        # Seed the board before the insert, or the new results would count twice
+        board = get_leaderboard()
+        # Profiles first: their one-off backfill reads the history without these
+        PROFILE_STORE.record(*results)
+        SCORE_STORE.add(*results)
+        board.extend(results)
+
+def announce_rank(result):
+    """Tell the player where a finished game lands on the leaderboard"""
+    board = get_leaderboard()
+    rank = board.would_rank(result.score, result.date)
+    # Only ranks the High Scores screen actually shows are worth announcing
+    if not rank or rank > HIGH_SCORES_SHOWN:
+        return
+    if len(board) < HIGH_SCORES_SHOWN:
+        # Any score makes a board that is not full yet - no "high score" about it
+        console.print(f"[green]You placed #{rank} on the leaderboard.[/green]")
+    else:
+        console.print(f"[bold green]🏅 New high score! You placed #{rank} on the leaderboard.[/bold green]")
 
 # ---------------- GAME ----------------
 
 class QuizGame:
 
-    def __init__(self, questions, negative_marking=False, player_name=None):
+    def __init__(self, questions, negative_marking=False, player_name=None, render_mode=None, pacing=None,
+                 profiler=None, listeners=(), review_queue=None, event_log=None):
         self.questions = questions
-        self.score = 0
         self.negative_marking = negative_marking
-        self.category_stats = {}
         self.player_name = player_name
+        self.renderer = make_renderer(console, render_mode or RENDER_MODE)
+        self.pacer = Pacer(pacing or PACING)
+        self.profiler = profiler or PROFILER
+        self.question_times = []
+        # All scoring lives in the UI-free engine so bots can drive it headless
+        self.keeper = ScoreKeeper(negative_marking)
+        # Called as listener(question, choice, outcome, response_time) after every answer
+        self.listeners = list(listeners)
+        self.review_queue = review_queue or REVIEW_QUEUE
+        self.review = ReviewRecorder()
+        self.event_log = event_log or EVENT_WRITER
+        self.listeners.extend([self.review.record, self.event_log.record])
+
+    @property
+    def score(self):
+        return self.keeper.score
+
+    @property
+    def category_stats(self):
+        return self.keeper.category_stats
 
     def ask_question(self, q, current, total):
-        console.clear()
-        console.print(Panel(f"Question {current}/{total}", style="bold magenta"))
-
         indexed = list(enumerate(q.choices))
         random.shuffle(indexed)
         new_indices, shuffled = zip(*indexed)
         correct_index = new_indices.index(q.answer_index)
 
-        question_panel = Panel(
-            f"[bold]{q.prompt}[/bold]\n\n"
-            f"[cyan]A.[/cyan] {shuffled[0]}\n"
-            f"[cyan]B.[/cyan] {shuffled[1]}\n"
-            f"[cyan]C.[/cyan] {shuffled[2]}\n"
-            f"[cyan]D.[/cyan] {shuffled[3]}\n\n"
-            f"[dim](Type 'skip' to skip this question)[/dim]",
-            title=f"{q.category} | {q.difficulty}",
-            box=box.ROUNDED
-        )
+        with self.profiler.span("render"):
+            self.renderer.show(question_frame(q, shuffled, current, total, self.score))
 
-        console.print(question_panel)
+        labels = ["A", "B", "C", "D"]
+        asked_at = time.perf_counter()
 
         while True:
             answer = console.input("[bold white]Your answer (A/B/C/D/skip): [/bold white]").upper()
             
-            labels = ["A", "B", "C", "D"]
-            
-            if answer == "SKIP":
-                correct_answer = shuffled[correct_index]
-                console.print(f"[yellow]Skipped! (0 point)[/yellow]")
-                console.print(f"[yellow]Correct answer was {labels[correct_index]}: {correct_answer}[/yellow]")
-                
-                if q.category not in self.category_stats:
-                    self.category_stats[q.category] = {"correct": 0, "total": 0}
-                self.category_stats[q.category]["total"] += 1
-                
-                time.sleep(2)
-                return
-            elif answer in labels:
+            if answer == "SKIP" or answer in labels:
                 break
             else:
                 console.print("[red]Invalid input! Please enter A, B, C, D, or 'skip'[/red]")
 
-        if q.category not in self.category_stats:
-            self.category_stats[q.category] = {"correct": 0, "total": 0}
-        self.category_stats[q.category]["total"] += 1
+        # Response time is the wait for a valid answer - no rendering or feedback
+        response_time = time.perf_counter() - asked_at
+        self.profiler.record("input", response_time)
+        self.question_times.append(response_time)
+
+        with self.profiler.span("scoring"):
+            choice = None if answer == "SKIP" else new_indices[labels.index(answer)]
+            outcome = self.keeper.answer(q, choice)
+            for listener in self.listeners:
+                listener(q, choice, outcome, response_time)
+
+        if answer == "SKIP":
+            correct_answer = shuffled[correct_index]
+            console.print(f"[yellow]Skipped! (0 point)[/yellow]")
+            console.print(f"[yellow]Correct answer was {labels[correct_index]}: {correct_answer}[/yellow]")
+            
+            self.pacer.pause("skip")
+            return
 
-        if labels.index(answer) == correct_index:
+        if outcome.correct:
             console.print("[green]✓ Correct! (+1 point)[/green]")
-            self.score += 1
-            self.category_stats[q.category]["correct"] += 1
         else:
             correct_answer = shuffled[correct_index]
             if self.negative_marking:
-                console.print(f"[red]Wrong! Correct answer was {labels[correct_index]}: {correct_answer} (-0.25 points)[/red]")
-                self.score -= 0.25
+                console.print(f"[red]Wrong! Correct answer was {labels[correct_index]}: {correct_answer} ({outcome.points:g} points)[/red]")
             else:
                 console.print(f"[red]Wrong! Correct answer was {labels[correct_index]}: {correct_answer}[/red]")
 
-        time.sleep(1.5)
+        self.pacer.pause("reveal")
 
     def run(self):
         console.clear()
@@ -277,27 +298,37 @@ class QuizGame:
         else:
             name = console.input("[bold yellow]Enter your name: [/bold yellow]")
         
-        random.shuffle(self.questions)
+        # Streams arrive in random order and are pulled one question at a time
+        if isinstance(self.questions, list):
+            random.shuffle(self.questions)
         total = len(self.questions)
         start_time = time.time()
+        asked = 0
 
         for i, q in enumerate(self.questions, 1):
             self.ask_question(q, i, total)
+            asked = i
             
             if i >= total - 1:
                 elapsed = time.time() - start_time
                 minutes = int(elapsed // 60)
                 seconds = int(elapsed % 60)
-                console.clear()
-                console.print(f"[cyan]Progress: {i}/{total} questions completed[/cyan]")
-                console.print(f"[yellow]Time elapsed: {minutes}m {seconds}s[/yellow]")
-                time.sleep(1)
-
-        total_time = time.time() - start_time
+                self.renderer.show(Group(
+                    f"[cyan]Progress: {i}/{total} questions completed[/cyan]",
+                    f"[yellow]Time elapsed: {minutes}m {seconds}s[/yellow]"
+                ))
+                self.pacer.pause("progress")
+
+        # A stream that ran short scores out of what was actually asked
+        total = asked
+        # Time spent holding feedback on screen is ours, not the player's
+        feedback_time = self.pacer.paused
+        total_time = time.time() - start_time - feedback_time
         minutes = int(total_time // 60)
         seconds = int(total_time % 60)
 
         console.clear()
+        self.renderer.reset()
         
         if self.negative_marking:
             score_text = f"[bold green]Final Score: {self.score:.2f}/{total}[/bold green]"
@@ -311,13 +342,20 @@ class QuizGame:
         
         show_category_progress(self.category_stats)
 
+        # Misses and skips (and reviews of queued questions) update the schedule
+        self.review_queue.schedule(name, self.review.answers)
+        self.event_log.flush()
+
         return Result(
             player_name=name,
             score=self.score,
             max_score=total,
             date=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             total_time=total_time,
-            category_stats=self.category_stats
+            category_stats=self.category_stats,
+            feedback_time=feedback_time,
+            question_times=self.question_times,
+            answer_time=sum(self.question_times)
         )
 
 # ---------------- HIGH SCORES ----------------
@@ -350,6 +388,8 @@ def show_category_progress(category_stats):
     console.print()
 
 def show_high_scores():
+    from rich.table import Table
+
     scores = load_high_scores()
 
     table = Table(title="High Scores", box=box.HEAVY_EDGE)
@@ -359,7 +399,8 @@ def show_high_scores():
     table.add_column("Time")
     table.add_column("Date")
 
-    for i, r in enumerate(sorted(scores, key=lambda r: (-r.score, r.date))[:10], 1):
+    # The store already returns results best first
+    for i, r in enumerate(scores[:HIGH_SCORES_SHOWN], 1):
         time_str = "N/A"
         if r.total_time:
             minutes = int(r.total_time // 60)
@@ -375,10 +416,50 @@ def show_high_scores():
 
     console.print(table)
 
+def show_profile(player_name):
+    """Lifetime stats for one player, straight from the running aggregates"""
+    profile = PROFILE_STORE.get(player_name)
+    if profile is None:
+        console.print(f"[red]No games recorded for {player_name}.[/red]")
+        return
+
+    hours = int(profile.total_time // 3600)
+    minutes = int(profile.total_time % 3600 // 60)
+    console.print(Panel(
+        f"[bold yellow]Games played:[/bold yellow] {profile.games}\n"
+        f"[bold yellow]Best score:[/bold yellow] {profile.best_score:g}\n"
+        f"[bold yellow]Average score:[/bold yellow] {profile.average_score:.2f}\n"
+        f"[bold yellow]Overall accuracy:[/bold yellow] {profile.accuracy * 100:.0f}%\n"
+        f"[bold yellow]Time played:[/bold yellow] {hours}h {minutes}m\n"
+        f"[dim]First game {profile.first_played} - last game {profile.last_played}[/dim]",
+        title=f"Profile: {profile.player_name}",
+        style="bold cyan"
+    ))
+    show_category_progress(profile.category_stats)
+
+# ---------------- REVIEW MODE ----------------
+
+def review_mode(player_name, amount=10):
+    """Replay the player's due questions; answers reschedule them"""
+    questions = REVIEW_QUEUE.due(player_name, amount)
+    if not questions:
+        next_due = REVIEW_QUEUE.next_due(player_name)
+        if next_due is None:
+            console.print(f"[green]Nothing to review for {player_name} - missed questions will show up here.[/green]")
+        else:
+            when = datetime.datetime.fromtimestamp(next_due).strftime("%Y-%m-%d %H:%M")
+            console.print(f"[green]All caught up! Next review is due {when}.[/green]")
+        return
+
+    # Practice only - reviews are not ranked on the leaderboard
+    QuizGame(questions, player_name=player_name).run()
+
 # ---------------- MULTIPLAYER MODE ----------------
 
 def multiplayer_mode(questions):
     """Two-player mode where both players answer the same questions"""
+    from rich.table import Table
+
     console.clear()
     console.print(Panel("🎮 Multiplayer Mode", style="bold magenta"))
     
@@ -417,6 +498,10 @@ def multiplayer_mode(questions):
     time1_str = f"{int(result1.total_time // 60)}m {int(result1.total_time % 60)}s"
     time2_str = f"{int(result2.total_time // 60)}m {int(result2.total_time % 60)}s"
     
+    # Ties go to the faster player, judged on time actually spent answering
+    pace1 = result1.answer_time if result1.answer_time is not None else result1.total_time
+    pace2 = result2.answer_time if result2.answer_time is not None else result2.total_time
+    
     if result1.score > result2.score:
         winner = player1_name
         results_table.add_row(
@@ -446,7 +531,7 @@ def multiplayer_mode(questions):
             "[green]🏆 WINNER![/green]"
         )
     else:
-        if result1.total_time < result2.total_time:
+        if pace1 < pace2:
             winner = player1_name
             results_table.add_row(
                 player1_name,
@@ -460,7 +545,7 @@ def multiplayer_mode(questions):
                 time2_str,
                 "[red]Lost (Slower)[/red]"
             )
-        elif result2.total_time < result1.total_time:
+        elif pace2 < pace1:
             winner = player2_name
             results_table.add_row(
                 player1_name,
@@ -496,10 +581,7 @@ def multiplayer_mode(questions):
     else:
         console.print(f"\n[bold yellow]🤝 Perfect tie! Both players performed equally well![/bold yellow]")
     
-    scores = load_high_scores()
-    scores.append(result1)
-    scores.append(result2)
-    save_high_scores(scores)
+    save_result(result1, result2)
 
 # ---------------- MENU ----------------
 
@@ -528,7 +610,9 @@ def main_menu():
         console.print("[bold cyan]1.[/bold cyan] Play Quiz (Single Player)")
         console.print("[bold cyan]2.[/bold cyan] Multiplayer Mode")
         console.print("[bold cyan]3.[/bold cyan] High Scores")
-        console.print("[bold cyan]4.[/bold cyan] Exit")
+        console.print("[bold cyan]4.[/bold cyan] Player Profile")
+        console.print("[bold cyan]5.[/bold cyan] Review Mode")
+        console.print("[bold cyan]6.[/bold cyan] Exit")
 
         choice = console.input("\nChoose option: ")
 
@@ -580,10 +664,11 @@ def main_menu():
             console.print("[cyan]1.[/cyan] Easy")
             console.print("[cyan]2.[/cyan] Medium")
             console.print("[cyan]3.[/cyan] Hard")
+            console.print("[cyan]4.[/cyan] Adaptive (follows your rating)")
             console.print("[dim]Press Enter for random difficulty[/dim]")
             
             while True:
-                diff_input = console.input("[yellow]Difficulty (1-3): [/yellow]")
+                diff_input = console.input("[yellow]Difficulty (1-4): [/yellow]")
                 if diff_input == "":
                     difficulty = None
                     break
@@ -596,20 +681,51 @@ def main_menu():
                 elif diff_input == "3":
                     difficulty = "hard"
                     break
+                elif diff_input == "4":
+                    difficulty = "adaptive"
+                    break
                 else:
-                    console.print("[red]Invalid input! Please enter 1, 2, or 3.[/red]")
+                    console.print("[red]Invalid input! Please enter 1, 2, 3, or 4.[/red]")
             
-            api_questions = fetch_questions_from_api(num_questions, category, difficulty)
+            # Ratings are per player, so adaptive games need the name up front
+            player_name = None
+            if difficulty == "adaptive":
+                while not player_name:
+                    player_name = console.input("[bold yellow]Enter your name: [/bold yellow]").strip()
             
-            if api_questions:
-                game = QuizGame(api_questions, negative_marking=True)
+            while True:
+                listeners = []
+                if difficulty == "adaptive":
+                    selector = AdaptiveSelector(get_fallback_bank, player_name, category,
+                                                store=RATING_STORE, seen=SEEN_QUESTIONS)
+                    listeners.append(selector.record)
+                    api_questions = QuestionStream(selector.questions(num_questions), num_questions)
+                    ready = bool(api_questions)
+                else:
+                    with PROFILER.span("fetch"):
+                        api_questions = PREFETCHER.take(num_questions, category, difficulty, fetch=question_stream)
+                        # The stream stays lazy - its truth test waits for the first question
+                        ready = bool(api_questions)
+                
+                if not ready:
+                    console.print("[red]Failed to fetch questions. Please try again.[/red]")
+                    break
+                
+                game = QuizGame(api_questions, negative_marking=True, player_name=player_name,
+                                listeners=listeners)
                 result = game.run()
+                if difficulty == "adaptive":
+                    selector.save()
+                else:
+                    # The game's stream is drained - the refill cannot race it now
+                    PREFETCHER.prefetch(category, difficulty)
                 
-                scores = load_high_scores()
-                scores.append(result)
-                save_high_scores(scores)
-            else:
-                console.print("[red]Failed to fetch questions. Please try again.[/red]")
+                announce_rank(result)
+                save_result(result)
+                
+                again = console.input("\n[yellow]Play again with the same settings? (y/N): [/yellow]")
+                if again.strip().lower() != "y":
+                    break
             
             console.input("\nPress Enter to return to menu...")
         elif choice == "2":
@@ -679,12 +795,21 @@ def main_menu():
                 else:
                     console.print("[red]Invalid input! Please enter 1, 2, or 3.[/red]")
             
-            api_questions = fetch_questions_from_api(num_questions, category, difficulty)
-            
-            if api_questions:
+            while True:
+                with PROFILER.span("fetch"):
+                    api_questions = PREFETCHER.take(num_questions, category, difficulty, fetch=fetch_questions_from_api)
+                
+                if not api_questions:
+                    console.print("[red]Failed to fetch questions. Please try again.[/red]")
+                    break
+                
+                # Already a list, so the next round can load while this one is played
+                PREFETCHER.prefetch(category, difficulty)
                 multiplayer_mode(api_questions)
-            else:
-                console.print("[red]Failed to fetch questions. Please try again.[/red]")
+                
+                again = console.input("\n[yellow]Play another round? (y/N): [/yellow]")
+                if again.strip().lower() != "y":
+                    break
             
             console.input("\nPress Enter to return to menu...")
         elif choice == "3":
@@ -692,11 +817,25 @@ def main_menu():
             show_high_scores()
             console.input("\nPress Enter to return...")
         elif choice == "4":
+            console.clear()
+            player_name = console.input("[bold yellow]Player name: [/bold yellow]").strip()
+            if player_name:
+                show_profile(player_name)
+            console.input("\nPress Enter to return...")
+        elif choice == "5":
+            console.clear()
+            player_name = console.input("[bold yellow]Player name: [/bold yellow]").strip()
+            if player_name:
+                review_mode(player_name)
+            console.input("\nPress Enter to return to menu...")
+        elif choice == "6":
+            if PROFILE_EXPORT:
+                PROFILER.export(PROFILE_EXPORT)
             console.print("[bold red]Goodbye![/bold red]")
             break
         else:
-            console.print("[red]Invalid option! Please enter 1, 2, 3, or 4.[/red]")
-            time.sleep(1.5)
+            console.print("[red]Invalid option! Please enter 1, 2, 3, 4, 5, or 6.[/red]")
+            Pacer(PACING).pause("notice")
 
 if __name__ == "__main__":
     main_menu()
\ No newline at end of file
@@ -0,0 +1,87 @@
+from __future__ import annotations
+from rich import box
+from rich.console import Console, Group
+from rich.panel import Panel
+
+# ---------------- RENDERING ----------------
+
+# Rows kept free under a frame for feedback and the input prompt; if the
+# frame does not fit above them the screen could scroll, so redraw fully
+FEEDBACK_ROWS = 6
+
+def question_frame(q, shuffled, current, total, score):
+    """The question screen: header with progress and score, then the question"""
+    score_str = f"{score:.2f}" if isinstance(score, float) and score % 1 != 0 else f"{int(score)}"
+    header = Panel(f"Question {current}/{total}    Score: {score_str}", style="bold magenta")
+    question_panel = Panel(
+        f"[bold]{q.prompt}[/bold]\n\n"
+        f"[cyan]A.[/cyan] {shuffled[0]}\n"
+        f"[cyan]B.[/cyan] {shuffled[1]}\n"
+        f"[cyan]C.[/cyan] {shuffled[2]}\n"
+        f"[cyan]D.[/cyan] {shuffled[3]}\n\n"
+        f"[dim](Type 'skip' to skip this question)[/dim]",
+        title=f"{q.category} | {q.difficulty}",
+        box=box.ROUNDED
+    )
+    return Group(header, question_panel)
+
+class FullRenderer:
+    """Clears the terminal and prints the whole frame every time"""
+
+    def __init__(self, console: Console):
+        self.console = console
+
+    def show(self, renderable):
+        self.console.clear()
+        self.console.print(renderable)
+
+    def reset(self):
+        pass
+
+class DiffRenderer:
+    """Rewrites only the lines of a frame that changed since the last one
+
+    The frame is rendered off-screen, compared line by line with what is
+    already on the terminal, and only differing rows are rewritten in place
+    with cursor addressing. Everything below the frame (the last answer's
+    feedback and input echo) is then erased, so the prompt lands right under
+    the frame again. Over a slow link most of a question screen - borders,
+    labels, the skip hint - is never resent.
+    """
+
+    def __init__(self, console: Console):
+        self.console = console
+        self._lines = None
+
+    def reset(self):
+        """Forget what is on screen - call after anything else clears it"""
+        self._lines = None
+
+    def _render(self, renderable):
+        with self.console.capture() as capture:
+            self.console.print(renderable)
+        return capture.get().rstrip("\n").split("\n")
+
+    def show(self, renderable):
+        lines = self._render(renderable)
+        previous = self._lines
+
+        if previous is None or len(lines) + FEEDBACK_ROWS > self.console.size.height:
+            self.console.clear()
+            out = ["\n".join(lines), "\n"]
+        else:
+            out = []
+            for row, line in enumerate(lines, 1):
+                if row > len(previous) or previous[row - 1] != line:
+                    out.append(f"\x1b[{row};1H{line}\x1b[K")
+            out.append(f"\x1b[{len(lines) + 1};1H\x1b[J")
+
+        self._lines = lines
+        self.console.file.write("".join(out))
+        self.console.file.flush()
+
+def make_renderer(console: Console, mode="diff"):
+    """Pick a renderer; diffing needs a real ANSI terminal"""
+    if mode == "diff" and console.is_terminal and not console.legacy_windows:
+        return DiffRenderer(console)
+    return FullRenderer(console)
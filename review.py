@@ -0,0 +1,169 @@
+"""Spaced-repetition review queue (SM-2)
+
+Questions a player misses or skips go into a per-player queue. Each review
+grades the answer 0-5, and the SM-2 update turns that grade into a new ease
+factor and interval, so well-known questions come back less and less often.
+
+The queue is a SQLite table with one row per (player, question), not one
+per answer, and an index on (player, due). "The next N due questions" is
+therefore an index range scan that reads N rows, however many years of
+answers sit behind it.
+"""
+from __future__ import annotations
+import json
+import sqlite3
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from dedup import fingerprint
+from engine import Outcome
+from models import Question
+
+DAY = 86400.0
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+# Answers slower than this still count, but as a hesitant recall
+SLOW_ANSWER = 15.0
+FAST_ANSWER = 5.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS review_items (
+    player TEXT NOT NULL,
+    key INTEGER NOT NULL,
+    due REAL NOT NULL,
+    ease REAL NOT NULL,
+    interval REAL NOT NULL,
+    reps INTEGER NOT NULL,
+    lapses INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    PRIMARY KEY (player, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS review_due ON review_items (player, due);
+"""
+
+# ---------------- SM-2 ----------------
+
+def grade(outcome: Outcome, response_time=None) -> int:
+    """SM-2 quality 0-5: skip 0, wrong 1, correct 3-5 by how quickly it came"""
+    if outcome.skipped:
+        return 0
+    if not outcome.correct:
+        return 1
+    if response_time is None:
+        return 4
+    if response_time <= FAST_ANSWER:
+        return 5
+    return 3 if response_time > SLOW_ANSWER else 4
+
+def sm2(ease, interval, reps, quality) -> Tuple[float, float, int]:
+    """Next (ease, interval in days, repetitions) after a review graded ``quality``"""
+    if quality < 3:
+        # A lapse starts the ladder again from tomorrow
+        reps, interval = 0, 1.0
+    else:
+        reps += 1
+        if reps == 1:
+            interval = 1.0
+        elif reps == 2:
+            interval = 6.0
+        else:
+            interval = interval * ease
+    ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return ease, interval, reps
+
+# ---------------- QUEUE ----------------
+
+class ReviewRecorder:
+    """QuizGame answer listener that keeps (question, grade) for one game"""
+
+    def __init__(self):
+        self.answers: List[Tuple[Question, int]] = []
+
+    def record(self, q: Question, choice: Optional[int], outcome: Outcome, response_time=None):
+        self.answers.append((q, grade(outcome, response_time)))
+
+class ReviewQueue:
+    """Persistent per-player priority queue of questions keyed by due time"""
+
+    def __init__(self, path, busy_timeout=30.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def schedule(self, player, answers: Iterable[Tuple[Question, int]], now=None):
+        """Apply one game's graded answers to the player's queue
+
+        Misses and skips enter the queue; correct answers only reschedule
+        questions that are already in it.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            conn = self.conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                for q, quality in answers:
+                    key = fingerprint(q.prompt, q.choices)
+                    row = conn.execute(
+                        "SELECT ease, interval, reps, lapses FROM review_items WHERE player = ? AND key = ?",
+                        (player, key)
+                    ).fetchone()
+                    if row is None:
+                        if quality >= 3:
+                            continue
+                        row = (INITIAL_EASE, 0.0, 0, 0)
+                    ease, interval, reps, lapses = row
+                    ease, interval, reps = sm2(ease, interval, reps, quality)
+                    lapses += quality < 3
+                    conn.execute(
+                        "INSERT OR REPLACE INTO review_items "
+                        "(player, key, due, ease, interval, reps, lapses, question) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (player, key, now + interval * DAY, ease, interval, reps, lapses, json.dumps([
+                            q.prompt, q.choices, q.answer_index, q.category, q.difficulty
+                        ]))
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def due(self, player, limit=10, now=None) -> List[Question]:
+        """Up to ``limit`` questions whose review is due, most overdue first"""
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT question FROM review_items WHERE player = ? AND due <= ? ORDER BY due LIMIT ?",
+                (player, now, limit)
+            ).fetchall()
+        return [Question(*json.loads(question)) for (question,) in rows]
+
+    def next_due(self, player) -> Optional[float]:
+        """Timestamp of the player's earliest scheduled review, if any"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT due FROM review_items WHERE player = ? ORDER BY due LIMIT 1", (player,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def count(self, player) -> int:
+        with self._lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM review_items WHERE player = ?", (player,)
+            ).fetchone()[0]
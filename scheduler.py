@@ -0,0 +1,358 @@
+"""Room scheduler - thousands of quiz matches as state machines on one loop
+
+Each ``Match`` is a plain object holding one ScoreKeeper per player; it has
+no task or coroutine of its own. The ``RoomScheduler`` owns a single timer
+heap for every room's question deadline and a round-robin run queue of rooms
+with pending answers. Each turn a room processes at most ``batch_budget``
+answers, so a busy room cannot starve the others, and every room's inbox is
+bounded, so ``submit`` waits (back-pressure) when a room falls behind.
+
+Drive it locally with the in-process client swarm:
+
+    python scheduler.py --rooms 5000 --players 4 --questions 10
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import heapq
+import itertools
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from engine import ScoreKeeper
+from models import Question
+
+LOBBY = "lobby"
+QUESTION = "question"
+FINISHED = "finished"
+
+# on_event(match, player_name or None for everyone, message)
+EventHandler = Callable[["Match", Optional[str], dict], None]
+
+# ---------------- MATCH ----------------
+
+class Match:
+    """One room's quiz as an explicit state machine: lobby -> question* -> finished"""
+    __slots__ = ("room_id", "questions", "keepers", "answers", "state", "index", "deadline",
+                 "order", "inbox", "inbox_limit", "space", "on_event", "last_answer_at", "queued")
+
+    def __init__(self, room_id, questions: List[Question], players, on_event: EventHandler,
+                 negative_marking=True, inbox_limit=64):
+        self.room_id = room_id
+        self.questions = questions
+        self.keepers: Dict[str, ScoreKeeper] = {p: ScoreKeeper(negative_marking) for p in players}
+        self.answers: Dict[str, Optional[int]] = {}
+        self.state = LOBBY
+        self.index = -1
+        self.deadline = 0.0
+        self.order: List[int] = []
+        self.inbox: Deque[tuple] = deque()
+        self.inbox_limit = inbox_limit
+        self.space: Optional[asyncio.Event] = None
+        self.on_event = on_event
+        self.last_answer_at = 0.0
+        self.queued = False
+
+    def scores(self):
+        return sorted(([name, k.score] for name, k in self.keepers.items()), key=lambda s: -s[1])
+
+    def ask(self, now, answer_time):
+        """Move to the next question, or finish; returns the new deadline"""
+        self.index += 1
+        self.answers.clear()
+        if self.index >= len(self.questions):
+            self.state = FINISHED
+            self.on_event(self, None, {"type": "end", "scores": self.scores()})
+            return None
+
+        q = self.questions[self.index]
+        self.state = QUESTION
+        self.order = list(range(len(q.choices)))
+        random.shuffle(self.order)
+        self.deadline = now + answer_time
+        self.on_event(self, None, {
+            "type": "question",
+            "index": self.index,
+            "total": len(self.questions),
+            "prompt": q.prompt,
+            "choices": [q.choices[c] for c in self.order],
+            "deadline": answer_time,
+        })
+        return self.deadline
+
+    def apply(self, name, index, choice) -> bool:
+        """Record one answer; returns True once every player has answered"""
+        if self.state != QUESTION or index != self.index or name not in self.keepers or name in self.answers:
+            return False
+        if choice is not None and not 0 <= choice < len(self.order):
+            choice = None
+        self.answers[name] = None if choice is None else self.order[choice]
+        return len(self.answers) == len(self.keepers)
+
+    def resolve(self):
+        """Score the current question for everyone, including players who timed out"""
+        q = self.questions[self.index]
+        correct_choice = self.order.index(q.answer_index)
+        for name, keeper in self.keepers.items():
+            outcome = keeper.answer(q, self.answers.get(name))
+            self.on_event(self, name, {
+                "type": "result",
+                "index": self.index,
+                "correct_choice": correct_choice,
+                "points": outcome.points,
+                "score": keeper.score,
+            })
+        self.on_event(self, None, {"type": "leaderboard", "index": self.index, "scores": self.scores()})
+
+# ---------------- SCHEDULER ----------------
+
+class RoomScheduler:
+    """Runs every match from one coroutine with shared timers and fair turns"""
+
+    def __init__(self, answer_time=20.0, inbox_limit=64, batch_budget=8, latency_window=100_000):
+        self.answer_time = answer_time
+        self.inbox_limit = inbox_limit
+        self.batch_budget = batch_budget
+        self.rooms: Dict[str, Match] = {}
+        self.finished = 0
+        self.answers_processed = 0
+        self.timeouts = 0
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+        self._timers: List[tuple] = []
+        self._run_queue: Deque[Match] = deque()
+        self._seq = itertools.count()
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    # Room lifecycle
+
+    def create_room(self, room_id, questions, players, on_event: EventHandler, negative_marking=True) -> Match:
+        if room_id in self.rooms:
+            raise ValueError(f"Room {room_id!r} already exists")
+        match = Match(room_id, questions, players, on_event, negative_marking, self.inbox_limit)
+        self.rooms[room_id] = match
+        return match
+
+    def start_room(self, room_id):
+        match = self.rooms[room_id]
+        if match.state == LOBBY:
+            self._advance(match, time.perf_counter())
+
+    def _advance(self, match: Match, now):
+        deadline = match.ask(now, self.answer_time)
+        if deadline is None:
+            self.finished += 1
+            del self.rooms[match.room_id]
+            if match.space:
+                match.space.set()
+        else:
+            heapq.heappush(self._timers, (deadline, next(self._seq), match, match.index))
+            self._notify()
+
+    # Answers and back-pressure
+
+    def try_submit(self, room_id, name, index, choice) -> bool:
+        """Queue an answer without waiting; False if the room's inbox is full"""
+        match = self.rooms.get(room_id)
+        if match is None:
+            return True
+        if len(match.inbox) >= match.inbox_limit:
+            return False
+        match.inbox.append((name, index, choice, time.perf_counter()))
+        if not match.queued:
+            match.queued = True
+            self._run_queue.append(match)
+            self._notify()
+        return True
+
+    async def submit(self, room_id, name, index, choice):
+        """Queue an answer, waiting while the room's inbox is full"""
+        while not self.try_submit(room_id, name, index, choice):
+            match = self.rooms[room_id]
+            if match.space is None:
+                match.space = asyncio.Event()
+            match.space.clear()
+            await match.space.wait()
+
+    def _notify(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    # Main loop
+
+    def _run_turn(self, match: Match):
+        """Process up to batch_budget answers from one room"""
+        resolved = False
+        for _ in range(min(self.batch_budget, len(match.inbox))):
+            name, index, choice, queued_at = match.inbox.popleft()
+            self.answers_processed += 1
+            match.last_answer_at = queued_at
+            if match.apply(name, index, choice):
+                resolved = True
+                break
+
+        if match.space is not None and len(match.inbox) < match.inbox_limit:
+            match.space.set()
+
+        if resolved:
+            now = time.perf_counter()
+            match.resolve()
+            # Answer-to-result: the last answer's arrival to its results going out
+            self.latencies.append(now - match.last_answer_at)
+            self._advance(match, now)
+
+        if match.inbox and match.room_id in self.rooms:
+            self._run_queue.append(match)
+        else:
+            match.queued = False
+
+    def _expire_timers(self, now):
+        while self._timers and self._timers[0][0] <= now:
+            _, _, match, index = heapq.heappop(self._timers)
+            # Stale timer: the question was already resolved early
+            if match.state != QUESTION or match.index != index or match.room_id not in self.rooms:
+                continue
+            self.timeouts += 1
+            match.resolve()
+            self._advance(match, now)
+
+    async def run(self, until_idle=False):
+        """Serve every room until stop() (or until no rooms remain if ``until_idle``)"""
+        self._wake = asyncio.Event()
+        while not self._stopping:
+            self._expire_timers(time.perf_counter())
+
+            # One turn per ready room, then yield so clients can keep submitting
+            for _ in range(len(self._run_queue)):
+                self._run_turn(self._run_queue.popleft())
+
+            if until_idle and not self.rooms:
+                return
+            if self._run_queue:
+                await asyncio.sleep(0)
+                continue
+
+            timeout = None
+            if self._timers:
+                timeout = max(0.0, self._timers[0][0] - time.perf_counter())
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        self._stopping = True
+        self._notify()
+
+    # Metrics
+
+    def metrics(self):
+        latencies = sorted(self.latencies)
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else None
+
+        traced = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        return {
+            "active_rooms": len(self.rooms),
+            "finished_rooms": self.finished,
+            "answers_processed": self.answers_processed,
+            "timeouts": self.timeouts,
+            "queued_rooms": len(self._run_queue),
+            "p50_answer_to_result": pct(0.50),
+            "p99_answer_to_result": pct(0.99),
+            "memory_per_room": traced / len(self.rooms) if traced and self.rooms else None,
+        }
+
+# ---------------- CLIENT SWARM ----------------
+
+class Swarm:
+    """Stand-in clients: each player answers every question after a random delay"""
+
+    def __init__(self, scheduler: RoomScheduler, think_time=0.05, accuracy=0.6, skip_rate=0.05):
+        self.scheduler = scheduler
+        self.think_time = think_time
+        self.accuracy = accuracy
+        self.skip_rate = skip_rate
+        self.events = 0
+        self._tasks = set()
+
+    def on_event(self, match: Match, player, message):
+        self.events += 1
+        if message["type"] == "question":
+            # Timer callbacks instead of a task per answer keep the swarm itself cheap
+            loop = asyncio.get_running_loop()
+            for name in match.keepers:
+                loop.call_later(random.uniform(0, self.think_time), self._answer, match, name, message)
+
+    def _answer(self, match: Match, name, message):
+        if random.random() < self.skip_rate:
+            choice = None
+        elif random.random() < self.accuracy:
+            # The swarm peeks at the answer so accuracy is controllable
+            choice = match.order.index(match.questions[message["index"]].answer_index)
+        else:
+            choice = random.randrange(len(message["choices"]))
+
+        if not self.scheduler.try_submit(match.room_id, name, message["index"], choice):
+            # Inbox full - wait for space like a real client would
+            task = asyncio.ensure_future(self.scheduler.submit(match.room_id, name, message["index"], choice))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+async def run_swarm(rooms, players, num_questions, answer_time, think_time, report_every=1.0):
+    from quiz_final import load_fallback_questions
+
+    scheduler = RoomScheduler(answer_time=answer_time)
+    swarm = Swarm(scheduler, think_time=think_time)
+    questions = load_fallback_questions(max(num_questions * 4, 50))
+
+    tracemalloc.start()
+    base_memory = tracemalloc.get_traced_memory()[0]
+    for r in range(rooms):
+        scheduler.create_room(f"room{r}", random.sample(questions, num_questions),
+                              [f"p{i}" for i in range(players)], swarm.on_event)
+    memory_per_room = (tracemalloc.get_traced_memory()[0] - base_memory) / rooms
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    runner = asyncio.ensure_future(scheduler.run(until_idle=True))
+    for r in range(rooms):
+        scheduler.start_room(f"room{r}")
+
+    while not runner.done():
+        await asyncio.wait([runner], timeout=report_every)
+        m = scheduler.metrics()
+        p99 = m["p99_answer_to_result"]
+        print(f"  active {m['active_rooms']:>6}  finished {m['finished_rooms']:>6}  "
+              f"answers {m['answers_processed']:>8,}  "
+              f"p99 {p99 * 1000 if p99 is not None else float('nan'):6.2f} ms")
+
+    elapsed = time.perf_counter() - start
+    m = scheduler.metrics()
+    # No percentiles when every question ran to its deadline
+    p50, p99 = (float("nan") if p is None else p * 1000
+                for p in (m["p50_answer_to_result"], m["p99_answer_to_result"]))
+    print(f"{rooms:,} rooms x {players} players x {num_questions} questions in {elapsed:.2f} s")
+    print(f"answers {m['answers_processed']:,} ({m['answers_processed'] / elapsed:,.0f}/s), "
+          f"timeouts {m['timeouts']}, p50 {p50:.2f} ms, "
+          f"p99 {p99:.2f} ms, ~{memory_per_room / 1024:.1f} KiB per room")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive the room scheduler with an in-process client swarm")
+    parser.add_argument("--rooms", type=int, default=1000)
+    parser.add_argument("--players", type=int, default=4)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--answer-time", type=float, default=5.0)
+    parser.add_argument("--think-time", type=float, default=0.05)
+    args = parser.parse_args(argv)
+    asyncio.run(run_swarm(args.rooms, args.players, args.questions, args.answer_time, args.think_time))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
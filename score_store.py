@@ -0,0 +1,169 @@
+from __future__ import annotations
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import asdict
+from typing import Iterator, List
+
+from models import Result
+
+# ---------------- SCORE STORE ----------------
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    player_name TEXT NOT NULL,
+    score REAL NOT NULL,
+    max_score INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    total_time REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_rank ON results (score DESC, date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+class ScoreStore:
+    """SQLite-backed history of every finished game
+
+    Each result is a single indexed insert instead of a sort and full-file
+    rewrite, and SQLite's file locking keeps several game processes writing
+    at once safe. The full Result is kept as JSON in ``data`` so new fields
+    round-trip without a schema change.
+    """
+
+    def __init__(self, path, legacy_json=None, busy_timeout=30.0):
+        self.path = path
+        self.legacy_json = legacy_json
+        self.busy_timeout = busy_timeout
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            # isolation_level=None so transactions are explicit below
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout,
+                                   isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+            if self.legacy_json:
+                self.migrate_json(self.legacy_json)
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _row(result: Result):
+        return (
+            result.player_name,
+            result.score,
+            result.max_score,
+            result.date,
+            result.total_time,
+            json.dumps(asdict(result))
+        )
+
+    def add(self, *results: Result):
+        """Append results atomically - readers never see a partial write"""
+        self.add_many(results)
+
+    def add_many(self, results):
+        with self._lock:
+            conn = self.conn
+            # IMMEDIATE takes the write lock up front so concurrent writers queue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT INTO results (player_name, score, max_score, date, total_time, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (self._row(r) for r in results)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def top(self, n) -> List[Result]:
+        """Best ``n`` results by score, earliest first on ties (walks the index)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT data FROM results ORDER BY score DESC, date LIMIT ?", (n,)
+            ).fetchall()
+        return [Result(**json.loads(data)) for (data,) in rows]
+
+    def count(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def iter_results(self, batch_size=1000) -> Iterator[Result]:
+        """Stream every stored result in insertion order without loading them all"""
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT id, data FROM results WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for last_id, data in rows:
+                yield Result(**json.loads(data))
+
+    def iter_rows(self, batch_size=10000) -> Iterator[tuple]:
+        """Stream raw (player_name, score, max_score, date, total_time, data) rows
+
+        Skips building Result objects - used by the columnar analytics loader.
+        """
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT id, player_name, score, max_score, date, total_time, data "
+                    "FROM results WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            for row in rows:
+                yield row[1:]
+
+    def migrate_json(self, json_path):
+        """One-off import of the old high_scores.json leaderboard"""
+        conn = self._conn
+        done = conn.execute("SELECT value FROM meta WHERE key = 'migrated_json'").fetchone()
+        if done or not os.path.exists(json_path):
+            return 0
+
+        try:
+            with open(json_path, "r", encoding="utf-8") as f:
+                results = [Result(**r) for r in json.load(f)]
+        except (OSError, ValueError, TypeError):
+            results = []
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-check under the write lock in case another process won the race
+            if conn.execute("SELECT value FROM meta WHERE key = 'migrated_json'").fetchone():
+                conn.execute("ROLLBACK")
+                return 0
+            conn.executemany(
+                "INSERT INTO results (player_name, score, max_score, date, total_time, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._row(r) for r in results)
+            )
+            conn.execute("INSERT INTO meta (key, value) VALUES ('migrated_json', ?)", (json_path,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return len(results)
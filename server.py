@@ -0,0 +1,319 @@
+"""Asyncio multiplayer server - N players answer the same questions at once
+
+Protocol: one JSON object per line over TCP.
+
+Client -> server
+    {"type": "join", "room": "abc", "name": "alice"}
+    {"type": "start"}                               any player may start the room
+    {"type": "answer", "index": 0, "choice": 2}     choice is 0-3, or null to skip
+
+Server -> client
+    {"type": "joined", "room": ..., "players": [...]}
+    {"type": "question", "index", "total", "prompt", "choices", "category", "difficulty", "deadline"}
+    {"type": "result", "index", "correct_choice", "choice", "points", "score"}
+    {"type": "leaderboard", "index", "scores": [[name, score], ...]}
+    {"type": "end", "scores": [[name, score], ...]}
+    {"type": "error", "message": ...}
+
+Run with:
+
+    python server.py --port 8765 --questions 10 --answer-time 20
+
+and join from a terminal with ``python client.py --room abc --name alice``.
+"""
+from __future__ import annotations
+import argparse
+import asyncio
+import datetime
+import json
+import random
+import sys
+from typing import Callable, Dict, List, Optional
+
+from engine import ScoreKeeper
+from models import Question
+
+# ---------------- ROOMS ----------------
+
+class Player:
+    __slots__ = ("name", "writer", "keeper", "answer", "connected")
+
+    def __init__(self, name, writer, negative_marking):
+        self.name = name
+        self.writer = writer
+        self.keeper = ScoreKeeper(negative_marking)
+        self.answer = None
+        self.connected = True
+
+class Room:
+    """One match: a shared question list played by every joined player"""
+
+    def __init__(self, server: "QuizServer", name):
+        self.server = server
+        self.name = name
+        self.players: Dict[str, Player] = {}
+        self.started = False
+        self.current = -1
+        self._start = asyncio.Event()
+        self._all_answered = asyncio.Event()
+        self._choices: List[int] = []
+        self.task: Optional[asyncio.Task] = None
+
+    def join(self, name, writer) -> Optional[str]:
+        if self.started:
+            return "Match already in progress"
+        if name in self.players:
+            return "Name already taken in this room"
+        if len(self.players) >= self.server.max_players:
+            return "Room is full"
+        self.players[name] = Player(name, writer, self.server.negative_marking)
+        if len(self.players) >= self.server.max_players:
+            self._start.set()
+        return None
+
+    def leave(self, name):
+        player = self.players.get(name)
+        if player:
+            player.connected = False
+            if not self.started:
+                del self.players[name]
+                # Nobody left to start it - free the room
+                if not self.players and self.task:
+                    self.task.cancel()
+            self._check_answers()
+
+    def request_start(self):
+        self._start.set()
+
+    def submit(self, name, index, choice):
+        player = self.players.get(name)
+        if player is None or index != self.current or player.answer is not None:
+            return
+        if choice is not None and not (isinstance(choice, int) and 0 <= choice < len(self._choices)):
+            return
+        # Translate the displayed position back to Question.choices
+        player.answer = "skip" if choice is None else self._choices[choice]
+        self._check_answers()
+
+    def _check_answers(self):
+        if all(p.answer is not None for p in self.players.values() if p.connected):
+            self._all_answered.set()
+
+    def scores(self):
+        ranked = sorted(self.players.values(), key=lambda p: -p.keeper.score)
+        return [[p.name, p.keeper.score] for p in ranked]
+
+    async def broadcast(self, message):
+        line = (json.dumps(message) + "\n").encode()
+        await asyncio.gather(*(self.server.send_line(p, line) for p in self.players.values() if p.connected))
+
+    async def run(self):
+        await self._start.wait()
+        self.started = True
+        loop = asyncio.get_running_loop()
+        questions: Optional[List[Question]] = await loop.run_in_executor(
+            None, self.server.question_source, self.server.num_questions
+        )
+        if not questions:
+            # Nothing to play - tell everyone rather than leave them waiting
+            self.current = -1
+            await self.broadcast({"type": "error", "message": "No questions available"})
+            await self.broadcast({"type": "end", "scores": self.scores()})
+            return
+        total = len(questions)
+
+        for i, q in enumerate(questions):
+            if not any(p.connected for p in self.players.values()):
+                break
+            self.current = i
+            for p in self.players.values():
+                p.answer = None
+            self._all_answered.clear()
+
+            # Same shuffle for everyone so positions mean the same thing
+            self._choices = list(range(len(q.choices)))
+            random.shuffle(self._choices)
+            await self.broadcast({
+                "type": "question",
+                "index": i,
+                "total": total,
+                "prompt": q.prompt,
+                "choices": [q.choices[c] for c in self._choices],
+                "category": q.category,
+                "difficulty": q.difficulty,
+                "deadline": self.server.answer_time,
+            })
+
+            try:
+                await asyncio.wait_for(self._all_answered.wait(), self.server.answer_time)
+            except asyncio.TimeoutError:
+                pass
+
+            correct_choice = self._choices.index(q.answer_index)
+            sends = []
+            for p in self.players.values():
+                answer = None if p.answer in (None, "skip") else p.answer
+                outcome = p.keeper.answer(q, answer)
+                line = (json.dumps({
+                    "type": "result",
+                    "index": i,
+                    "correct_choice": correct_choice,
+                    "choice": None if answer is None else self._choices.index(answer),
+                    "points": outcome.points,
+                    "score": p.keeper.score,
+                }) + "\n").encode()
+                if p.connected:
+                    sends.append(self.server.send_line(p, line))
+            await asyncio.gather(*sends)
+            await self.broadcast({"type": "leaderboard", "index": i, "scores": self.scores()})
+
+        self.current = -1
+        await self.broadcast({"type": "end", "scores": self.scores()})
+        if self.server.on_finish:
+            date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            results = [p.keeper.result(p.name, total, date) for p in self.players.values()]
+            await loop.run_in_executor(None, self.server.on_finish, results)
+
+# ---------------- SERVER ----------------
+
+class QuizServer:
+    """Hosts any number of rooms on one event loop"""
+
+    def __init__(self, question_source: Callable[[int], List[Question]], num_questions=10,
+                 answer_time=20.0, max_players=16, negative_marking=True,
+                 send_timeout=5.0, on_finish=None):
+        self.question_source = question_source
+        self.num_questions = num_questions
+        self.answer_time = answer_time
+        self.max_players = max_players
+        self.negative_marking = negative_marking
+        self.send_timeout = send_timeout
+        self.on_finish = on_finish
+        self.rooms: Dict[str, Room] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host="127.0.0.1", port=8765):
+        self._server = await asyncio.start_server(self.handle_client, host, port)
+        return self._server
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for room in list(self.rooms.values()):
+            if room.task:
+                room.task.cancel()
+
+    @property
+    def port(self):
+        return self._server.sockets[0].getsockname()[1]
+
+    async def send_line(self, player: Player, line: bytes):
+        """Write to one client; a client that cannot keep up is dropped"""
+        try:
+            player.writer.write(line)
+            await asyncio.wait_for(player.writer.drain(), self.send_timeout)
+        except (ConnectionError, asyncio.TimeoutError):
+            player.connected = False
+            player.writer.close()
+
+    def _room(self, name) -> Room:
+        room = self.rooms.get(name)
+        if room is None or (room.task and room.task.done()):
+            room = self.rooms[name] = Room(self, name)
+            room.task = asyncio.ensure_future(room.run())
+            room.task.add_done_callback(lambda _t, n=name, r=room: self._room_done(n, r))
+        return room
+
+    def _room_done(self, name, room):
+        if self.rooms.get(name) is room:
+            del self.rooms[name]
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        room: Optional[Room] = None
+        name = None
+
+        async def error(message):
+            writer.write((json.dumps({"type": "error", "message": message}) + "\n").encode())
+            await writer.drain()
+
+        try:
+            async for raw in reader:
+                try:
+                    msg = json.loads(raw)
+                    kind = msg.get("type")
+                except (ValueError, AttributeError):
+                    await error("Invalid JSON")
+                    continue
+
+                if kind == "join" and room is None:
+                    name = str(msg.get("name", "")).strip()[:32]
+                    if not name:
+                        await error("Name required")
+                        continue
+                    candidate = self._room(str(msg.get("room", "lobby")))
+                    problem = candidate.join(name, writer)
+                    if problem:
+                        await error(problem)
+                        continue
+                    room = candidate
+                    await room.broadcast({"type": "joined", "room": room.name, "players": list(room.players)})
+                elif room is None:
+                    await error("Join a room first")
+                elif kind == "start":
+                    room.request_start()
+                elif kind == "answer":
+                    room.submit(name, msg.get("index"), msg.get("choice"))
+                else:
+                    await error(f"Unknown message type {kind!r}")
+        except ConnectionError:
+            pass
+        finally:
+            if room is not None:
+                room.leave(name)
+            writer.close()
+
+# ---------------- CLI ----------------
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the multiplayer quiz server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--answer-time", type=float, default=20.0, help="seconds per question")
+    parser.add_argument("--max-players", type=int, default=16)
+    parser.add_argument("--category", type=int, help="OpenTDB category id")
+    parser.add_argument("--difficulty", choices=["easy", "medium", "hard"])
+    parser.add_argument("--online", action="store_true", help="fetch questions from OpenTDB")
+    parser.add_argument("--no-save", action="store_true", help="do not record results in the high scores")
+    args = parser.parse_args(argv)
+
+    import quiz_final
+
+    def question_source(amount):
+        if args.online:
+            return quiz_final.fetch_questions_from_api(amount, args.category, args.difficulty, quiet=True)
+        return quiz_final.load_fallback_questions(amount, args.category, args.difficulty)
+
+    server = QuizServer(
+        question_source,
+        num_questions=args.questions,
+        answer_time=args.answer_time,
+        max_players=args.max_players,
+        on_finish=None if args.no_save else (lambda results: quiz_final.save_result(*results))
+    )
+
+    async def serve():
+        srv = await server.start(args.host, args.port)
+        print(f"Quiz server listening on {args.host}:{server.port}")
+        async with srv:
+            await srv.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""Multi-process simulation of many players through the headless engine
+
+Players are split into shards that run on a ProcessPoolExecutor. Each
+worker plays its shard with engine.play_session and returns only merged
+category_stats and a score histogram, so the parent does very little work
+and throughput grows with the number of cores.
+
+    python simulate.py --players 1000000 --accuracy 0.7 --skip-rate 0.1 --penalty 0.25
+"""
+from __future__ import annotations
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from engine import NEGATIVE_MARK, AccuracyBot, ScoreKeeper, merge_category_stats
+
+# ---------------- PLAYER MODELS ----------------
+
+@dataclass
+class PlayerModel:
+    """Share of the simulated population with one answering behaviour"""
+    name: str = "player"
+    weight: float = 1.0
+    accuracy: float = 0.7
+    skip_rate: float = 0.0
+    category_accuracy: Dict[str, float] = field(default_factory=dict)
+    category_skip_rate: Dict[str, float] = field(default_factory=dict)
+
+    def bot(self):
+        return AccuracyBot(self.accuracy, self.skip_rate, self.category_accuracy,
+                           self.category_skip_rate, name=self.name)
+
+@dataclass
+class SimulationConfig:
+    players: int = 100_000
+    questions_per_game: int = 10
+    category: Optional[int] = None
+    difficulty: Optional[str] = None
+    negative_marking: bool = True
+    penalty: float = NEGATIVE_MARK
+    models: List[PlayerModel] = field(default_factory=lambda: [PlayerModel()])
+    seed: int = 0
+
+# ---------------- WORKER ----------------
+
+_bank = None
+
+def _worker_bank():
+    # Built once per worker process, not once per shard
+    global _bank
+    if _bank is None:
+        from quiz_final import get_fallback_bank
+        _bank = get_fallback_bank()
+    return _bank
+
+def simulate_shard(config: SimulationConfig, shard: int, players: int):
+    """Play ``players`` games and return mergeable aggregates"""
+    rng = random.Random(config.seed * 1_000_003 + shard)
+    # QuestionBank.sample draws from the module-level generator
+    random.seed(rng.random())
+    bank = _worker_bank()
+
+    bots = [m.bot() for m in config.models]
+    weights = [m.weight for m in config.models]
+    histogram: Counter = Counter()
+    category_stats: Dict[str, Dict[str, int]] = {}
+    per_model = {m.name: {"players": 0, "score": 0.0} for m in config.models}
+
+    for bot in rng.choices(bots, weights, k=players):
+        questions = bank.sample(config.questions_per_game, config.category, config.difficulty)
+        keeper = ScoreKeeper(config.negative_marking, config.penalty)
+        for q in questions:
+            keeper.answer(q, bot(q, rng))
+        histogram[keeper.score] += 1
+        merge_category_stats(category_stats, keeper.category_stats)
+        per_model[bot.name]["players"] += 1
+        per_model[bot.name]["score"] += keeper.score
+
+    return {"histogram": histogram, "category_stats": category_stats, "per_model": per_model}
+
+# ---------------- RUNNER ----------------
+
+def merge(summaries):
+    histogram: Counter = Counter()
+    category_stats: Dict[str, Dict[str, int]] = {}
+    per_model: Dict[str, Dict[str, float]] = {}
+    for s in summaries:
+        histogram.update(s["histogram"])
+        merge_category_stats(category_stats, s["category_stats"])
+        for name, m in s["per_model"].items():
+            total = per_model.setdefault(name, {"players": 0, "score": 0.0})
+            total["players"] += m["players"]
+            total["score"] += m["score"]
+    return {"histogram": histogram, "category_stats": category_stats, "per_model": per_model}
+
+def percentile(histogram: Counter, p):
+    """Score at percentile ``p`` (0-100) of a score -> count histogram"""
+    target = p / 100 * (sum(histogram.values()) - 1)
+    seen = 0
+    for score in sorted(histogram):
+        seen += histogram[score]
+        if seen > target:
+            return score
+    return None
+
+def run_simulation(config: SimulationConfig, workers=None, shards_per_worker=4):
+    """Shard ``config.players`` across processes and merge what they return"""
+    workers = workers or os.cpu_count() or 1
+    shard_count = max(1, min(config.players, workers * shards_per_worker))
+    base, extra = divmod(config.players, shard_count)
+    sizes = [base + (1 if i < extra else 0) for i in range(shard_count)]
+
+    if workers == 1:
+        summaries = [simulate_shard(config, i, n) for i, n in enumerate(sizes)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            summaries = list(pool.map(simulate_shard, [config] * shard_count, range(shard_count), sizes))
+    return merge(summaries)
+
+def report(summary, players, elapsed):
+    histogram = summary["histogram"]
+    mean = sum(score * n for score, n in histogram.items()) / players
+    print(f"{players:,} players in {elapsed:.2f} s ({players / elapsed:,.0f} players/s)")
+    print(f"score mean {mean:.2f}  p10 {percentile(histogram, 10):g}  "
+          f"p50 {percentile(histogram, 50):g}  p90 {percentile(histogram, 90):g}")
+    for name, m in summary["per_model"].items():
+        if m["players"]:
+            print(f"  {name:20} {m['players']:>10,} players  mean {m['score'] / m['players']:.2f}")
+    print("category accuracy:")
+    for category, s in sorted(summary["category_stats"].items()):
+        print(f"  {category:28} {s['correct'] / s['total']:6.1%}  ({s['total']:,} answers)")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate many players across all cores")
+    parser.add_argument("--players", type=int, default=100_000)
+    parser.add_argument("--questions", type=int, default=10)
+    parser.add_argument("--category", type=int, help="OpenTDB category id")
+    parser.add_argument("--difficulty", choices=["easy", "medium", "hard"])
+    parser.add_argument("--accuracy", type=float, default=0.7)
+    parser.add_argument("--skip-rate", type=float, default=0.0)
+    parser.add_argument("--penalty", type=float, default=NEGATIVE_MARK, help="points lost per wrong answer")
+    parser.add_argument("--no-negative-marking", action="store_true")
+    parser.add_argument("--models", help="JSON file with a list of PlayerModel fields")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.models:
+        with open(args.models, "r", encoding="utf-8") as f:
+            models = [PlayerModel(**m) for m in json.load(f)]
+    else:
+        models = [PlayerModel(accuracy=args.accuracy, skip_rate=args.skip_rate)]
+
+    config = SimulationConfig(
+        players=args.players,
+        questions_per_game=args.questions,
+        category=args.category,
+        difficulty=args.difficulty,
+        negative_marking=not args.no_negative_marking,
+        penalty=args.penalty,
+        models=models,
+        seed=args.seed
+    )
+
+    start = time.perf_counter()
+    summary = run_simulation(config, args.workers)
+    report(summary, config.players, time.perf_counter() - start)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""Streaming question sources composed into a pipeline
+
+Every source is a generator of Question objects, and every stage wraps a
+generator and returns another one, so nothing is fetched or built until the
+game asks for the next question:
+
+    take(pad(dedup(fallback(api, cache, files, bank)), amount), amount)
+
+``fallback`` moves to the next source when one runs dry or raises, so the
+offline bank is only touched if the earlier sources come up short.
+"""
+from __future__ import annotations
+import os
+import random
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from dedup import DuplicateIndex
+from models import Question
+from question_bank import CATEGORY_MAP
+
+# ---------------- SOURCES ----------------
+
+def question_from_item(item) -> Optional[Question]:
+    """Question from an OpenTDB result item or a FALLBACK_QUESTIONS-style dict"""
+    if "correct_answer" in item:
+        from trivia_client import parse_results
+        return parse_results([item])[0]
+    if "prompt" in item:
+        return Question(
+            prompt=item["prompt"],
+            choices=item["choices"],
+            answer_index=item["answer_index"],
+            category=item.get("category", "General Knowledge"),
+            difficulty=item.get("difficulty", "Medium")
+        )
+    return None
+
+def pooled_source(fetcher, amount, category=None, difficulty=None) -> Iterator[Question]:
+    """Surplus left in the fetcher's pool by earlier full batches"""
+    questions = fetcher.take_pooled(amount, category, difficulty)
+    if questions:
+        yield from questions
+
+def cache_source(cache, fetcher, amount, category=None, difficulty=None) -> Iterator[Question]:
+    """Cached questions this session has not seen yet"""
+    questions = cache.get(category, difficulty, amount, exclude=fetcher.seen)
+    if questions:
+        fetcher.mark_seen(questions)
+        yield from questions
+
+def api_source(fetcher, amount, category=None, difficulty=None,
+               on_request: Optional[Callable[[], None]] = None) -> Iterator[Question]:
+    """Fresh questions from OpenTDB - one full batch covers a whole game"""
+    if on_request:
+        on_request()
+    yield from fetcher.fetch(amount, category, difficulty)
+
+def file_source(path, category=None, difficulty=None) -> Iterator[Question]:
+    """Questions from a local JSON / JSONL file, read one item at a time"""
+    from jsonstream import iter_json_array, iter_jsonl
+
+    if not os.path.exists(path):
+        return
+    items = iter_jsonl(path) if path.endswith(".jsonl") else iter_json_array(path)
+    yield from filter_questions((question_from_item(item) for item in items), category, difficulty)
+
+def bank_source(get_bank: Callable, amount, category=None, difficulty=None,
+                rounds=3) -> Iterator[Question]:
+    """The offline bank, with its usual relaxed-difficulty rules
+
+    Later rounds are only drawn if dedup dropped questions already shown
+    this session, so a repeat game still finds fresh ones when there are any.
+    """
+    for _ in range(rounds):
+        questions = get_bank().sample(amount, category, difficulty)
+        if not questions:
+            return
+        yield from questions
+
+# ---------------- STAGES ----------------
+
+def fallback(*sources: Iterable[Question]) -> Iterator[Question]:
+    """Drain sources in order, moving on when one is exhausted or fails"""
+    for source in sources:
+        try:
+            yield from source
+        except Exception:
+            # A failing source (network, bad file) just hands over to the next
+            continue
+
+def dedup(stream: Iterable[Question], seen: Optional[DuplicateIndex] = None) -> Iterator[Question]:
+    """Drop exact and near duplicates of anything ``seen`` already holds"""
+    seen = DuplicateIndex() if seen is None else seen
+    for q in stream:
+        if seen.add(q):
+            yield q
+
+def filter_questions(stream: Iterable[Optional[Question]], category=None, difficulty=None,
+                     predicate: Optional[Callable[[Question], bool]] = None) -> Iterator[Question]:
+    """Keep well-formed questions matching an API category id / difficulty"""
+    cat_name = CATEGORY_MAP.get(category) if category else None
+    diff_name = difficulty.capitalize() if difficulty else None
+    for q in stream:
+        if q is None or len(q.choices) != 4 or not 0 <= q.answer_index < 4:
+            continue
+        if cat_name and q.category != cat_name:
+            continue
+        if diff_name and q.difficulty != diff_name:
+            continue
+        if predicate and not predicate(q):
+            continue
+        yield q
+
+def pad(stream: Iterable[Question], amount, repeats: Iterable[Question] = ()) -> Iterator[Question]:
+    """Top up a stream that ends short of ``amount``
+
+    Questions from ``repeats`` (typically ones already shown this session)
+    are used first; after that the game's own questions are cycled.
+    """
+    yielded: List[Question] = []
+    for q in stream:
+        yielded.append(q)
+        yield q
+        if len(yielded) >= amount:
+            return
+
+    prompts = {q.prompt for q in yielded}
+    for q in repeats:
+        if q.prompt in prompts:
+            continue
+        prompts.add(q.prompt)
+        yielded.append(q)
+        yield q
+        if len(yielded) >= amount:
+            return
+    if not yielded:
+        return
+    repeats = [yielded[i % len(yielded)] for i in range(amount - len(yielded))]
+    random.shuffle(repeats)
+    yield from repeats
+
+def take(stream: Iterable[Question], amount) -> Iterator[Question]:
+    """First ``amount`` questions, without pulling one more from upstream"""
+    return islice(stream, amount)
+
+# ---------------- STREAM ----------------
+
+class QuestionStream:
+    """Lazy question sequence of a known target length for QuizGame
+
+    Truth-testing pulls just the first question, so callers can check that
+    a game is possible without waiting for the rest.
+    """
+
+    def __init__(self, stream: Iterable[Question], total: int):
+        self._stream = iter(stream)
+        self._head: List[Question] = []
+        self.total = total
+
+    def __len__(self):
+        return self.total
+
+    def __bool__(self):
+        if not self._head:
+            self._head = list(take(self._stream, 1))
+        return bool(self._head)
+
+    def __iter__(self):
+        head, self._head = self._head, []
+        yield from head
+        yield from self._stream
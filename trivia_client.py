@@ -0,0 +1,328 @@
+from __future__ import annotations
+import html
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from models import Question
+
+TRIVIA_API_URL = "https://opentdb.com/api.php"
+TRIVIA_TOKEN_URL = "https://opentdb.com/api_token.php"
+
+# OpenTDB caps a single request at 50 questions
+MAX_BATCH_SIZE = 50
+
+# OpenTDB response codes
+RESPONSE_OK = 0
+RESPONSE_NO_RESULTS = 1
+RESPONSE_INVALID_PARAMETER = 2
+RESPONSE_TOKEN_NOT_FOUND = 3
+RESPONSE_TOKEN_EMPTY = 4
+RESPONSE_RATE_LIMIT = 5
+
+# Status codes worth another attempt; anything else fails straight away
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# ---------------- HTTP CLIENT ----------------
+
+def _requests():
+    """Import requests on first use - it dominates startup otherwise"""
+    import requests
+    return requests
+
+class TriviaAPIError(Exception):
+    """Raised when a request still fails after all retries"""
+
+@dataclass
+class RequestMetric:
+    url: str
+    status: Optional[int]
+    latency: float
+    attempts: int
+    ok: bool
+
+class TriviaClient:
+    """Pooled HTTP client for OpenTDB with bounded retries
+
+    One ``requests.Session`` is reused for every call so games after the
+    first skip the TCP and TLS handshake. Failed attempts are retried with
+    capped exponential backoff, but only while the shared retry budget lasts,
+    so an outage does not multiply the wait on every call.
+    """
+
+    def __init__(self, base_url=TRIVIA_API_URL, connect_timeout=3.05, read_timeout=10,
+                 max_retries=3, backoff=0.5, max_backoff=4.0,
+                 retry_budget=10.0, budget_refill=0.1, pool_size=4, metrics_size=256):
+        self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_budget = retry_budget
+        self.budget_refill = budget_refill
+        self.pool_size = pool_size
+        self.metrics: deque = deque(maxlen=metrics_size)
+        self._budget = retry_budget
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        if self._session is None:
+            from requests.adapters import HTTPAdapter
+
+            session = _requests().Session()
+            adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _spend_retry(self):
+        with self._lock:
+            if self._budget < 1:
+                return False
+            self._budget -= 1
+            return True
+
+    def _refill(self):
+        with self._lock:
+            self._budget = min(self.retry_budget, self._budget + self.budget_refill)
+
+    def _delay(self, attempt):
+        # Full jitter keeps many clients from retrying in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    def get_json(self, params=None, url=None):
+        """GET ``url`` (the API endpoint by default) and decode the JSON body"""
+        requests = _requests()
+        url = url or self.base_url
+        attempt = 0
+        start = time.perf_counter()
+
+        while True:
+            status = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                status = response.status_code
+                if status not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    data = response.json()
+                    self._refill()
+                    self._record(url, status, start, attempt, True)
+                    return data
+                error = TriviaAPIError(f"HTTP {status} from {url}")
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            except (requests.RequestException, ValueError) as e:
+                # Client errors and bad JSON will not get better on retry
+                self._record(url, status, start, attempt, False)
+                raise TriviaAPIError(str(e)) from e
+
+            if attempt >= self.max_retries or not self._spend_retry():
+                self._record(url, status, start, attempt, False)
+                raise TriviaAPIError(f"Giving up on {url} after {attempt + 1} attempts") from error
+
+            time.sleep(self._delay(attempt))
+            attempt += 1
+
+    def _record(self, url, status, start, attempt, ok):
+        self.metrics.append(RequestMetric(
+            url=url,
+            status=status,
+            latency=time.perf_counter() - start,
+            attempts=attempt + 1,
+            ok=ok
+        ))
+
+    def latency_stats(self):
+        """Summary of recent request latencies in seconds"""
+        latencies = sorted(m.latency for m in self.metrics)
+        if not latencies:
+            return {"count": 0}
+
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+        return {
+            "count": len(latencies),
+            "failures": sum(1 for m in self.metrics if not m.ok),
+            "retries": sum(m.attempts - 1 for m in self.metrics),
+            "mean": sum(latencies) / len(latencies),
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "max": latencies[-1],
+        }
+
+# ---------------- SESSION FETCHER ----------------
+
+def parse_results(results) -> List[Question]:
+    """Turn OpenTDB result items into Question objects"""
+    questions = []
+    for item in results:
+        prompt = html.unescape(item['question'])
+        correct = html.unescape(item['correct_answer'])
+        incorrect = [html.unescape(ans) for ans in item['incorrect_answers']]
+
+        all_choices = incorrect + [correct]
+        answer_index = len(incorrect)
+
+        questions.append(Question(
+            prompt=prompt,
+            choices=all_choices,
+            answer_index=answer_index,
+            category=html.unescape(item['category']),
+            difficulty=item['difficulty'].capitalize()
+        ))
+    return questions
+
+class TriviaFetcher:
+    """Pulls full batches under an OpenTDB session token
+
+    The API never repeats a question for the same token, and every pull asks
+    for the maximum batch so the surplus can serve later games from memory.
+    Prompts already handed out are remembered so a session has no repeats.
+    """
+
+    def __init__(self, client: TriviaClient, token_url=TRIVIA_TOKEN_URL, batch_size=MAX_BATCH_SIZE,
+                 rate_limit_wait=5.0, max_attempts=4, token_retry_after=60.0,
+                 on_batch: Optional[Callable[..., None]] = None):
+        self.client = client
+        self.token_url = token_url
+        self.batch_size = batch_size
+        self.rate_limit_wait = rate_limit_wait
+        self.max_attempts = max_attempts
+        self.token_retry_after = token_retry_after
+        self.on_batch = on_batch
+        self.requests_made = 0
+        self.seen = set()
+        self._token: Optional[str] = None
+        # When the last token request failed - offline, we stop asking for a while
+        self._token_failed_at: Optional[float] = None
+        self._pools: Dict[tuple, deque] = {}
+        # Guards the pools and seen set - held only briefly, never across a request
+        self._lock = threading.RLock()
+        # Serializes requests and the waits between them, so a background
+        # pull never holds up take_pooled / mark_seen on the main thread
+        self._request_lock = threading.Lock()
+        # OpenTDB allows one api.php call per IP every rate_limit_wait seconds
+        self._last_request: Optional[float] = None
+
+    # Token handling
+
+    def _request_token(self):
+        try:
+            data = self.client.get_json({"command": "request"}, url=self.token_url)
+            self._token = data.get("token") if data.get("response_code") == RESPONSE_OK else None
+        except TriviaAPIError:
+            # Still usable without a token, we just lose server-side dedup
+            self._token = None
+        self._token_failed_at = time.monotonic() if self._token is None else None
+
+    def _token_due(self):
+        """No token yet, and no recent failed request to back off from"""
+        return self._token is None and (
+            self._token_failed_at is None
+            or time.monotonic() - self._token_failed_at >= self.token_retry_after
+        )
+
+    def _reset_token(self):
+        try:
+            self.client.get_json({"command": "reset", "token": self._token}, url=self.token_url)
+        except TriviaAPIError:
+            self._token = None
+
+    # Rate limiting
+
+    def _wait_for_slot(self):
+        """Sleep out whatever is left of the rate-limit window"""
+        if self._last_request is not None:
+            remaining = self.rate_limit_wait - (time.monotonic() - self._last_request)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    # Pooling
+
+    def mark_seen(self, questions):
+        with self._lock:
+            self.seen.update(q.prompt for q in questions)
+
+    def take_pooled(self, amount, category=None, difficulty=None) -> Optional[List[Question]]:
+        """Serve from questions left over by earlier batches, without a request"""
+        with self._lock:
+            pool = self._pools.get((category, difficulty))
+            if not pool or len(pool) < amount:
+                return None
+            questions = [pool.popleft() for _ in range(amount)]
+            self.mark_seen(questions)
+            return questions
+
+    def fetch(self, amount, category=None, difficulty=None) -> List[Question]:
+        """Return ``amount`` unseen questions, pulling full batches as needed"""
+        with self._request_lock:
+            while True:
+                with self._lock:
+                    pool = self._pools.setdefault((category, difficulty), deque())
+                    if len(pool) >= amount:
+                        return [pool.popleft() for _ in range(amount)]
+                    missing = amount - len(pool)
+                batch = self._pull(max(self.batch_size, missing), missing, category, difficulty)
+                with self._lock:
+                    fresh = [q for q in batch if q.prompt not in self.seen]
+                    if not fresh:
+                        raise TriviaAPIError(f"Only {len(pool)} of {amount} questions available")
+                    self.seen.update(q.prompt for q in fresh)
+                    pool.extend(fresh)
+
+    def _pull(self, amount, needed, category, difficulty) -> List[Question]:
+        amount = min(amount, MAX_BATCH_SIZE)
+        if self._token_due():
+            self._request_token()
+
+        for _ in range(self.max_attempts):
+            params = {'amount': amount, 'type': 'multiple'}
+            if category:
+                params['category'] = category
+            if difficulty:
+                params['difficulty'] = difficulty
+            if self._token:
+                params['token'] = self._token
+
+            self._wait_for_slot()
+            data = self.client.get_json(params)
+            # Only a request that reached OpenTDB uses up the slot
+            self._last_request = time.monotonic()
+            self.requests_made += 1
+            code = data.get('response_code')
+
+            if code == RESPONSE_OK:
+                questions = parse_results(data['results'])
+                if self.on_batch:
+                    self.on_batch(category, difficulty, questions)
+                return questions
+            elif code == RESPONSE_NO_RESULTS and amount > needed:
+                # Fewer questions left than a full batch - ask for just enough
+                amount = needed
+            elif code == RESPONSE_TOKEN_NOT_FOUND:
+                self._request_token()
+            elif code == RESPONSE_TOKEN_EMPTY:
+                # Every question for this query has been served - start a new cycle
+                self._reset_token()
+                with self._lock:
+                    self.seen.clear()
+            elif code == RESPONSE_RATE_LIMIT:
+                # Another client on this IP used the slot - the next
+                # attempt waits out a fresh window from this response
+                pass
+            else:
+                raise TriviaAPIError(f"OpenTDB response code {code}")
+
+        raise TriviaAPIError(f"OpenTDB did not return questions after {self.max_attempts} attempts")